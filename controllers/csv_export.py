@@ -0,0 +1,71 @@
+"""
+CSV writing helpers shared by the exporters (UI-agnostic).
+"""
+import csv
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence
+
+# Same line terminator as csv.writer's default (excel) dialect
+CSV_EOL = '\r\n'
+_QUOTE_TRIGGERS = (',', '"', '\r', '\n')
+_INF = float('inf')
+# Rows are written per chunk, through a 1 MiB write buffer
+_CHUNK_ROWS = 1 << 16
+_WRITE_BUFFER = 1 << 20
+
+
+def needs_quoting(text: str) -> bool:
+    """True if csv.writer (QUOTE_MINIMAL) would quote this field."""
+    return any(ch in text for ch in _QUOTE_TRIGGERS)
+
+
+def quote_field(text: str) -> str:
+    """Quote a field the way csv.writer (QUOTE_MINIMAL) would; other fields are returned as they are."""
+    if needs_quoting(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def format_column(spec: str, values: Iterable[float], inf_text: Optional[str] = None) -> List[str]:
+    """Format a whole numeric column with one format spec; +inf becomes `inf_text` if given."""
+    fmt = ('{:' + spec + '}').format
+    if inf_text is None:
+        return list(map(fmt, values))
+    return [inf_text if v == _INF else fmt(v) for v in values]
+
+
+def write_csv(path: str, header: Sequence[str], rows: Iterable[Sequence[str]], safe: bool = False):
+    """Write header + rows of already formatted string fields to `path`.
+
+    The default fast path joins each row with ',' and hands the lines to write_csv_lines();
+    it assumes no field needs quoting. Pass safe=True to go through csv.writer instead
+    (writerows() per chunk of _CHUNK_ROWS, same write buffer).
+    """
+    if safe:
+        rows = iter(rows)
+        with open(path, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            while True:
+                chunk = list(islice(rows, _CHUNK_ROWS))
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+        return
+    write_csv_lines(path, header, map(','.join, rows))
+
+
+def write_csv_lines(path: str, header: Sequence[str], lines: Iterable[str]):
+    """Write header + already joined CSV lines (no line terminators) to `path`.
+
+    Lines are joined into one string per chunk of _CHUNK_ROWS and written as UTF-8 bytes,
+    keeping peak memory bounded on very large sweeps. No quoting is applied.
+    """
+    lines = iter(lines)
+    with open(path, 'wb', buffering=_WRITE_BUFFER) as f:
+        f.write((','.join(header) + CSV_EOL).encode('utf-8'))
+        while True:
+            chunk = list(islice(lines, _CHUNK_ROWS))
+            if not chunk:
+                break
+            f.write((CSV_EOL.join(chunk) + CSV_EOL).encode('utf-8'))
@@ -1,32 +1,49 @@
 import os
-import csv
-from typing import Callable, List, Dict, Tuple, Optional
+import re
+from array import array
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+from .csv_export import format_column, needs_quoting, quote_field, write_csv, write_csv_lines
+from .observable import Observable
 
+# Finite decimal / scientific-notation number (what a force entry may contain)
+_NUMBER = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+_FLOAT_RE = re.compile(r'\s*' + _NUMBER + r'\s*')
+# A whole clean forces file, as bytes: one number per line, blank lines and surrounding spaces allowed
+_NUMBER_B = _NUMBER.encode('ascii')
+_FLOAT_FILE_RE = re.compile(rb'\s*' + _NUMBER_B + rb'(?:[ \t\r\f\v]*\n\s*' + _NUMBER_B + rb')*\s*')
 
-class ForcesManager:
+REPORT_CSV_HEADERS = ('Siła [N]', 'Interfejs', 'Pow. Nom. [m²]', 'Ciśnienie [Pa]', 'Ciśnienie [MPa]')
+_REPORT_LINE = '{:.2f},{},{:.6e},{:.2e},{:.4f}'
+_REPORT_ROW = itemgetter('force_value', 'interface', 'area', 'pressure')
+
+
+def report_columns(report_data: List[Dict[str, object]]) -> Tuple[tuple, tuple, tuple, tuple]:
+    """Split report rows into (forces, interface names, areas, pressures) columns in one pass."""
+    if not report_data:
+        return (), (), (), ()
+    return tuple(zip(*map(_REPORT_ROW, report_data)))
+
+
+class ForcesManager(Observable):
     """Business logic for forces and pressure report generation. UI-agnostic."""
 
     def __init__(self, app=None):
-        self._observers: List[Callable[[str, dict], None]] = []
+        super().__init__()
         self.app = app
         self.forces: List[Dict[str, object]] = []  # each: {'value': number}
         self._system_interfaces: List[object] = []
-
-    # Observer pattern
-    def subscribe(self, cb: Callable[[str, dict], None]):
-        self._observers.append(cb)
-
-    def _notify(self, event_type: str, data: Optional[dict] = None):
-        payload = data or {}
-        for cb in list(self._observers):
-            try:
-                cb(event_type, payload)
-            except Exception:
-                pass
+        self._tcr_interfaces: List[object] = []
+        self._tcr_iface_names: Tuple[str, ...] = ()
+        self._tcr_areas = array('d')
 
     # System context
     def set_system(self, interfaces: List[object]):
         self._system_interfaces = interfaces or []
+        # TCR interfaces and their display names, cached until the next set_system()
+        self._tcr_interfaces = [it for it in self._system_interfaces if getattr(it, 'has_tcr', False)]
+        self._tcr_iface_names = tuple(f"{it.geom_top.name} → {it.geom_bottom.name}" for it in self._tcr_interfaces)
+        self._tcr_areas = array('d', [getattr(it, 'A_nominal', 0) for it in self._tcr_interfaces])
         self._notify('forces_system_set', {'interfaces': len(self._system_interfaces)})
 
     # Forces CRUD
@@ -51,37 +68,52 @@ class ForcesManager:
         return True, f'Wyczyściłem listę sił ({count} pozycji)'
 
     def import_forces_file(self, file_path: str) -> Tuple[bool, str, int]:
+        error, values, rejected = self.read_forces_file(file_path)
+        if error is not None:
+            return False, error, 0
+        return self.import_forces_array(values, rejected, os.path.basename(file_path))
+
+    def read_forces_file(self, file_path: str) -> Tuple[Optional[str], List[float], int]:
+        """Read and parse a forces file without touching the manager state (safe off the UI thread).
+
+        Returns (error message or None, parsed values, number of rejected lines).
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith('#')]
+            with open(file_path, 'rb', buffering=1 << 20) as f:
+                data = f.read()
         except Exception as e:
-            return False, f'Błąd przy czytaniu pliku sił: {e}', 0
+            return f'Błąd przy czytaniu pliku sił: {e}', [], 0
 
-        imported = 0
-        for line in lines:
-            try:
-                val = float(line)
-                self.forces.append({'value': val})
-                imported += 1
-            except ValueError:
-                continue
-        self._notify('forces_imported', {'count': imported, 'file': os.path.basename(file_path)})
+        if _FLOAT_FILE_RE.fullmatch(data):
+            # Clean file: one regex scan over the raw bytes, then float() straight from the tokens
+            return None, list(map(float, data.split())), 0
+
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError as e:
+            return f'Błąd przy czytaniu pliku sił: {e}', [], 0
+        lines = [s for s in map(str.strip, text.splitlines()) if s and s[0] != '#']
+        good = list(filter(_FLOAT_RE.fullmatch, lines))
+        return None, list(map(float, good)), len(lines) - len(good)
+
+    def import_forces_array(self, values: Iterable[float], rejected: int = 0,
+                            file_name: Optional[str] = None) -> Tuple[bool, str, int]:
+        """Append already parsed force values (any iterable of numbers, e.g. an array('d'))."""
+        new_forces = [{'value': v} for v in map(float, values)]
+        self.forces.extend(new_forces)
+        imported = len(new_forces)
+        self._notify('forces_imported', {'count': imported, 'rejected': rejected, 'file': file_name})
         if imported:
-            return True, f'Importowano {imported} sił z pliku', imported
+            msg = f'Importowano {imported} sił z pliku'
+            if rejected:
+                msg += f' (pominięte nieprawidłowe wiersze: {rejected})'
+            return True, msg, imported
         return False, 'Nie udało się importować sił z pliku (brak prawidłowych wpisów)', 0
 
     # Update values from UI entries
     def update_force_values(self, values: List[str]) -> List[Dict[str, object]]:
-        new_forces: List[Dict[str, object]] = []
-        for v in values:
-            if v == '':
-                new_forces.append({'value': ''})
-            else:
-                try:
-                    new_forces.append({'value': float(v)})
-                except ValueError:
-                    new_forces.append({'value': ''})
-        self.forces = new_forces
+        is_number = _FLOAT_RE.fullmatch
+        self.forces = [{'value': float(v) if is_number(v) else ''} for v in values]
         self._notify('forces_updated', {'count': len(self.forces)})
         return self.forces
 
@@ -89,50 +121,70 @@ class ForcesManager:
     def generate_report(self) -> Tuple[bool, str, List[Dict[str, object]]]:
         if not self.forces:
             return False, 'Zdefiniuj przynajmniej jedną siłę do generowania raportu', []
-        tcr_interfaces = [it for it in (self._system_interfaces or []) if getattr(it, 'has_tcr', False)]
+        tcr_interfaces = self._tcr_interfaces
         if not tcr_interfaces:
             return False, 'Nie ma żadnych interfejsów ze zdefiniowanym TCR', []
 
-        report_data: List[Dict[str, object]] = []
+        # Parse forces once
+        valid_forces = []
         for force_idx, fobj in enumerate(self.forces):
             try:
-                force_val = float(fobj.get('value', 0))
+                valid_forces.append((force_idx, float(fobj.get('value', 0))))
             except (ValueError, TypeError):
                 continue
-            for iface in tcr_interfaces:
-                try:
-                    a_nominal = getattr(iface, 'A_nominal', 0)
-                    pressure = force_val / a_nominal if a_nominal > 0 else 0
-                    iface_name = f"{iface.geom_top.name} → {iface.geom_bottom.name}"
-                    report_data.append({
-                        'force_idx': force_idx,
-                        'force_value': force_val,
-                        'interface': iface_name,
-                        'area': a_nominal,
-                        'pressure': pressure
-                    })
-                except Exception:
-                    continue
+        force_values = [f for _, f in valid_forces]
+
+        # Pressures interface-major (the area check is hoisted out of the force loop)...
+        zeros = [0] * len(force_values)
+        pressure_cols = [[f / a for f in force_values] if a > 0 else zeros for a in self._tcr_areas]
+        names = self._tcr_iface_names
+        areas = self._tcr_areas
+
+        # ...rows force-major, as displayed and exported
+        report_data: List[Dict[str, object]] = []
+        append = report_data.append
+        for (force_idx, force_val), pressures in zip(valid_forces, zip(*pressure_cols)):
+            for iface_name, a_nominal, pressure in zip(names, areas, pressures):
+                append({
+                    'force_idx': force_idx,
+                    'force_value': force_val,
+                    'interface': iface_name,
+                    'area': a_nominal,
+                    'pressure': pressure
+                })
         if not report_data:
             return False, 'Nie udało się wygenerować raportu', []
         self._notify('report_generated', {'rows': len(report_data)})
         return True, 'OK', report_data
 
-    def export_report_csv(self, file_path: str, report_data: List[Dict[str, object]]) -> Tuple[bool, str]:
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Siła [N]', 'Interfejs', 'Pow. Nom. [m²]', 'Ciśnienie [Pa]', 'Ciśnienie [MPa]'])
-                for row in report_data:
-                    force_val = row['force_value']
-                    iface_name = row['interface']
-                    area = row['area']
-                    pressure_pa = row['pressure']
-                    pressure_mpa = pressure_pa / 1e6
-                    writer.writerow([
-                        f"{force_val:.2f}", iface_name, f"{area:.6e}", f"{pressure_pa:.2e}", f"{pressure_mpa:.4f}"
-                    ])
+    def export_report_csv(self, file_path: str, report_data: List[Dict[str, object]], safe: bool = False) -> Tuple[bool, str]:
+        ok, msg = self.write_report_csv(file_path, report_data, safe)
+        if ok:
             self._notify('report_exported', {'file': os.path.basename(file_path)})
+        return ok, msg
+
+    def write_report_csv(self, file_path: str, report_data: List[Dict[str, object]], safe: bool = False) -> Tuple[bool, str]:
+        """Write the report CSV without sending events (safe off the UI thread)."""
+        forces, names, areas, pressures = report_columns(report_data)
+        if not safe and any(needs_quoting(name) for name in set(names)):
+            # Quote the few distinct interface names by hand and stay on the fast path
+            quoted = {name: quote_field(name) for name in set(names)}
+            names = [quoted[name] for name in names]
+        pressures_mpa = [p / 1e6 for p in pressures]
+        try:
+            if safe:
+                rows = zip(
+                    format_column('.2f', forces),
+                    names,
+                    format_column('.6e', areas),
+                    format_column('.2e', pressures),
+                    format_column('.4f', pressures_mpa),
+                )
+                write_csv(file_path, REPORT_CSV_HEADERS, rows, safe=True)
+            else:
+                # One format call per line
+                lines = map(_REPORT_LINE.format, forces, names, areas, pressures, pressures_mpa)
+                write_csv_lines(file_path, REPORT_CSV_HEADERS, lines)
             return True, f'Raport został wyeksportowany do: {file_path}'
         except Exception as e:
             return False, f'Nie udało się wyeksportować raportu: {e}'
@@ -1,61 +1,133 @@
+import json
+import math
 import os
-from typing import Callable, Dict, List, Tuple, Optional
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple, TextIO
+from .observable import Observable
 
+# Numeric material fields that only geometries in a TCR interface may define
+_TCR_FIELDS = ('young', 'poisson', 'sigma', 'm', 'hc')
+# Numeric columns of a material import line, in file order
+_NUMERIC_FIELDS = ('k',) + _TCR_FIELDS
+# Every material field, in table / file order
+MATERIAL_FIELDS = ('material_name',) + _NUMERIC_FIELDS
 
-class MaterialsManager:
+
+def _iter_data_lines(f: TextIO) -> Iterator[str]:
+    """Yield stripped lines of an open text file, skipping blank and '#' comment lines."""
+    for ln in f:
+        s = ln.strip()
+        if s and s[0] != '#':
+            yield s
+
+
+class MaterialsManager(Observable):
     """Business logic for materials and TIMs, UI-agnostic.
-    Implements a simple Observer pattern for events.
+    Publishes events through the Observable base.
+
+    Materials are stored column-wise: one list per field, indexed through a
+    geometry name -> row map; get_materials() builds the {name: {field: value}} view,
+    once per version of the columns (every material mutation bumps `_version`).
     """
     def __init__(self, app=None):
-        self._observers: List[Callable[[str, dict], None]] = []
+        super().__init__()
         self.app = app
-        self.materials: Dict[str, Dict[str, object]] = {}
+        self._material_idx: Dict[str, int] = {}
+        self._material_cols: Dict[str, List[object]] = {fld: [] for fld in MATERIAL_FIELDS}
+        self._version = 0
+        self._view: Dict[str, Dict[str, object]] = {}
+        self._view_version = 0
         self.tims: List[Dict[str, object]] = []
         self._tim_next_id: int = 1
         self._system_geoms: List[object] = []
         self._system_interfaces: List[object] = []
-
-    # Observer API
-    def subscribe(self, callback: Callable[[str, dict], None]):
-        self._observers.append(callback)
-
-    def _notify(self, event_type: str, data: Optional[dict] = None):
-        payload = data or {}
-        for cb in list(self._observers):
-            try:
-                cb(event_type, payload)
-            except Exception:
-                pass
+        self._tcr_interfaces: List[object] = []
+        self._tcr_names: FrozenSet[str] = frozenset()
 
     # System context
     def set_system(self, geoms: List[object], interfaces: List[object]):
         self._system_geoms = geoms or []
         self._system_interfaces = interfaces or []
+        # Cached until the next set_system()
+        self._tcr_interfaces = [it for it in self._system_interfaces if getattr(it, 'has_tcr', False)]
+        names = set()
+        for it in self._tcr_interfaces:
+            try:
+                names.add(it.geom_top.name)
+                names.add(it.geom_bottom.name)
+            except Exception:
+                pass
+        self._tcr_names = frozenset(names)
         self._notify('materials_system_set', {'geoms_count': len(self._system_geoms)})
 
     def get_system(self):
         return self._system_geoms, self._system_interfaces
 
+    def tcr_geometry_names(self) -> FrozenSet[str]:
+        """Names of the geometries on either side of a TCR interface of the current system."""
+        return self._tcr_names
+
     # Materials accessors
+    def _material_index(self, name: str) -> int:
+        """Row of `name` in the material columns, appending an all-empty row if it is new."""
+        idx = self._material_idx.get(name)
+        if idx is None:
+            idx = self._material_idx[name] = len(self._material_idx)
+            for col in self._material_cols.values():
+                col.append('')
+            self._version += 1
+        return idx
+
     def get_materials(self) -> Dict[str, Dict[str, object]]:
-        return self.materials
+        """Materials as {geometry name: {field: value}}.
+
+        The view is cached until the next material change, which builds a new one instead of
+        updating it, so a returned dict is a stable snapshot; do not modify it (use set_materials).
+        """
+        if self._view_version != self._version:
+            rows = zip(*(self._material_cols[fld] for fld in MATERIAL_FIELDS))
+            self._view = {name: dict(zip(MATERIAL_FIELDS, row)) for name, row in zip(self._material_idx, rows)}
+            self._view_version = self._version
+        return self._view
+
+    def get_material(self, name: str) -> Dict[str, object]:
+        """Fields of one geometry's material ({} if it has none); a new dict."""
+        idx = self._material_idx.get(name)
+        if idx is None:
+            return {}
+        return {fld: self._material_cols[fld][idx] for fld in MATERIAL_FIELDS}
 
     def set_materials(self, materials: Dict[str, Dict[str, object]]):
-        self.materials = materials or {}
-        self._notify('materials_updated', {'count': len(self.materials)})
-
-    def ensure_material_entry(self, name: str):
-        if name not in self.materials:
-            self.materials[name] = {
-                'material_name': '',
-                'k': '',
-                'young': '',
-                'poisson': '',
-                'sigma': '',
-                'm': '',
-                'hc': ''
-            }
-        return self.materials[name]
+        self._material_idx = {}
+        cols = self._material_cols = {fld: [] for fld in MATERIAL_FIELDS}
+        for name, entry in (materials or {}).items():
+            idx = self._material_index(name)
+            for fld, value in entry.items():
+                if fld in cols:
+                    cols[fld][idx] = value
+        self._version += 1
+        self._notify('materials_updated', {'count': len(self._material_idx)})
+
+    def ensure_material_entry(self, name: str) -> Dict[str, object]:
+        """Make sure `name` has a material row (all fields empty if new); returns a copy of it."""
+        idx = self._material_index(name)
+        return {fld: self._material_cols[fld][idx] for fld in MATERIAL_FIELDS}
+
+    def set_field(self, name: str, fld: str, raw: str) -> bool:
+        """Store one material field from user input, converting numeric fields to float once.
+        An invalid number is kept as raw text (and rejected by validate_before_save); returns False then.
+        """
+        col = self._material_cols[fld]
+        idx = self._material_index(name)
+        self._version += 1
+        if fld == 'material_name' or raw == '':
+            col[idx] = raw
+            return True
+        try:
+            col[idx] = float(raw)
+        except ValueError:
+            col[idx] = raw
+            return False
+        return True
 
     # TIMs accessors
     def get_tims(self) -> List[Dict[str, object]]:
@@ -82,116 +154,162 @@ class MaterialsManager:
         return True, f'Wyczyściłem listę TIM-ów ({count} pozycji)'
 
     def import_tim_file(self, file_path: str) -> Tuple[bool, str]:
+        error, parsed = self.read_tim_file(file_path)
+        if error is not None:
+            return False, error
+        return self.import_tim_entries(parsed, os.path.basename(file_path))
+
+    @staticmethod
+    def read_tim_file(file_path: str) -> Tuple[Optional[str], List[Tuple[str, float]]]:
+        """Read and parse a TIM file without touching the manager state (safe off the UI thread).
+
+        Returns (error message or None, [(name, k), ...]).
+        """
+        parsed: List[Tuple[str, float]] = []
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith('#')]
+                for line in _iter_data_lines(f):
+                    parts = line.split(None, 2)  # only name and k are read
+                    if len(parts) < 2:
+                        # skip malformed
+                        continue
+                    try:
+                        parsed.append((parts[0], float(parts[1])))
+                    except ValueError:
+                        continue
         except Exception as e:
-            return False, f'Błąd przy czytaniu pliku TIM: {e}'
-
-        imported = 0
-        for line in lines:
-            parts = line.split()
-            if len(parts) < 2:
-                # skip malformed
-                continue
-            tim_name = parts[0]
-            tim_k_str = parts[1]
-            try:
-                tim_k = float(tim_k_str)
-            except ValueError:
-                continue
+            return f'Błąd przy czytaniu pliku TIM: {e}', []
+        return None, parsed
+
+    def import_tim_entries(self, parsed: List[Tuple[str, float]], file_name: Optional[str] = None) -> Tuple[bool, str]:
+        """Append TIMs parsed by read_tim_file as new gas, pressure-independent entries."""
+        for tim_name, tim_k in parsed:
             tid = self._tim_next_id
             self._tim_next_id += 1
             self.tims.append({'id': tid, 'name': tim_name, 'k': tim_k, 'type': 'gas', 'pressure_dependent': False})
-            imported += 1
+        imported = len(parsed)
         if imported:
-            self._notify('tims_imported', {'count': imported, 'file': os.path.basename(file_path)})
+            self._notify('tims_imported', {'count': imported, 'file': file_name})
             return True, f'Importowano {imported} TIM-ów z pliku'
         return False, 'Nie udało się importować TIM-ów z pliku (brak prawidłowych wpisów)'
 
     # Materials import
     def import_materials_from_file(self, file_path: str) -> Tuple[bool, str, int]:
+        error, updates = self.read_materials_file(file_path)
+        if error is not None:
+            return False, error, 0
+        return self.apply_material_updates(updates, os.path.basename(file_path))
+
+    def read_materials_file(self, file_path: str) -> Tuple[Optional[str], List[Tuple[str, Dict[str, object]]]]:
+        """Parse a materials file against the current system without storing anything
+        (safe off the UI thread). Returns (error message or None, [(geometry name, fields), ...]).
+        """
         geoms = self._system_geoms
-        interfaces = self._system_interfaces or []
         if not geoms:
-            return False, 'Brak systemu do załadowania. Zdefiniuj system w zakładce System i naciśnij Save System.', 0
+            return 'Brak systemu do załadowania. Zdefiniuj system w zakładce System i naciśnij Save System.', []
+
+        geom_names = {getattr(g, 'name', '') for g in geoms}
+        iface_names = self._tcr_names
+
+        # Single streaming pass; nothing is applied until the whole file was read
+        updates: List[Tuple[str, Dict[str, object]]] = []
+        append = updates.append
+        parse_fields = self._parse_material_fields
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith('#')]
+                for line in _iter_data_lines(f):
+                    parts = line.split()
+                    name = parts[0]
+                    if name not in geom_names:
+                        # unknown geometry -> skip
+                        continue
+                    append((name, parse_fields(parts, name in iface_names)))
         except Exception as e:
-            return False, f'Failed to open file: {e}', 0
+            return f'Failed to open file: {e}', []
+        return None, updates
 
-        geom_names = {getattr(g, 'name', '') for g in geoms}
-        iface_names = set()
-        for it in interfaces:
-            try:
-                if getattr(it, 'has_tcr', False):
-                    iface_names.add(it.geom_top.name)
-                    iface_names.add(it.geom_bottom.name)
-            except Exception:
-                pass
+    def apply_material_updates(self, updates: List[Tuple[str, Dict[str, object]]],
+                               file_name: Optional[str] = None) -> Tuple[bool, str, int]:
+        """Store rows parsed by read_materials_file; later rows for the same geometry win."""
+        cols = self._material_cols
+        material_index = self._material_index
+        for name, fields in updates:
+            idx = material_index(name)
+            for fld, value in fields.items():
+                cols[fld][idx] = value
+        self._version += 1
+        imported = len(updates)
+        self._notify('materials_imported', {'count': imported, 'file': file_name})
+        return True, f'Import materiałów zakończony', imported
 
-        imported = 0
-        for i, line in enumerate(lines, start=1):
-            parts = line.split()
-            if not parts:
-                continue
-            name = parts[0]
-            if name not in geom_names:
-                # unknown geometry -> skip
-                continue
-            allowed_all = name in iface_names
-            self.ensure_material_entry(name)
-            # material_name
-            if len(parts) >= 2:
-                self.materials[name]['material_name'] = parts[1]
-            # k
-            if len(parts) >= 3:
+    @staticmethod
+    def _parse_material_fields(parts: List[str], allowed_all: bool) -> Dict[str, object]:
+        """Parse `name material_name k young poisson sigma m hc`; invalid numbers are skipped."""
+        fields: Dict[str, object] = {}
+        if len(parts) >= 2:
+            fields['material_name'] = parts[1]
+        names = _NUMERIC_FIELDS if allowed_all else _NUMERIC_FIELDS[:1]
+        raw = parts[2:2 + len(names)]
+        try:
+            # Fast path: the whole row converts in one go
+            fields.update(zip(names, map(float, raw)))
+        except ValueError:
+            for fname, value in zip(names, raw):
                 try:
-                    self.materials[name]['k'] = float(parts[2])
+                    fields[fname] = float(value)
                 except ValueError:
                     pass
-            # remaining numeric fields
-            field_names = ['young', 'poisson', 'sigma', 'm', 'hc']
-            for idx, fname in enumerate(field_names, start=3):
-                if len(parts) > idx:
-                    if not allowed_all:
-                        continue
-                    try:
-                        self.materials[name][fname] = float(parts[idx])
-                    except ValueError:
-                        pass
-            imported += 1
-        self._notify('materials_imported', {'count': imported, 'file': os.path.basename(file_path)})
-        return True, f'Import materiałów zakończony', imported
+        return fields
 
     # Validation before save
     def validate_before_save(self) -> Tuple[bool, str, List[str]]:
-        interfaces_with_tcr = [it for it in (self._system_interfaces or []) if getattr(it, 'has_tcr', False)]
+        interfaces_with_tcr = self._tcr_interfaces
         if interfaces_with_tcr and not self.tims:
             return False, 'Brak zdefiniowanych TIM-ów, mimo że system zawiera interfejsy z TCR. Zdefiniuj przynajmniej jeden TIM.', []
 
-        geom_names_required = set()
-        for it in interfaces_with_tcr:
-            try:
-                geom_names_required.add(it.geom_top.name)
-                geom_names_required.add(it.geom_bottom.name)
-            except Exception:
-                pass
+        geom_names_required = self._tcr_names
 
         missing_errors: List[str] = []
         required_fields = ['material_name', 'k', 'young', 'poisson', 'sigma', 'm', 'hc']
+        cols = self._material_cols
         for gname in sorted(geom_names_required):
-            vals = self.materials.get(gname, {})
+            idx = self._material_idx.get(gname)
             for fld in required_fields:
-                if fld not in vals or vals.get(fld, '') == '':
+                v = '' if idx is None else cols[fld][idx]
+                if v == '':
                     missing_errors.append(f'Bryła "{gname}": brak pola {fld}')
-                else:
-                    if fld != 'material_name':
-                        try:
-                            float(vals.get(fld))
-                        except Exception:
-                            missing_errors.append(f'Bryła "{gname}": pole {fld} ma nieprawidłową wartość')
+                elif fld != 'material_name':
+                    # Numeric fields are stored as floats by set_field()/import; anything else is invalid
+                    if not (isinstance(v, (int, float)) and math.isfinite(v)):
+                        missing_errors.append(f'Bryła "{gname}": pole {fld} ma nieprawidłową wartość')
         if missing_errors:
             return False, 'Nie wszystkie wymagane parametry materiałowe są zdefiniowane dla brył w interfejsach TCR. Sprawdź konsolę.', missing_errors
         return True, 'OK', []
+
+    # Snapshot persistence
+    def save_snapshot(self, file_path: str) -> Tuple[bool, str]:
+        """Write the materials and TIMs to a JSON file."""
+        data = {'materials': self.get_materials(), 'tims': self.tims}
+        try:
+            os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            return False, f'Nie udało się zapisać migawki materiałów: {e}'
+        return True, f'Zapisano migawkę materiałów do pliku: {os.path.basename(file_path)}'
+
+    def load_snapshot(self, file_path: str) -> Tuple[bool, str]:
+        """Replace the materials and TIMs with those of a save_snapshot() file."""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            return False, f'Nie udało się wczytać migawki materiałów: {e}'
+        materials = data.get('materials') if isinstance(data, dict) else None
+        tims = data.get('tims') if isinstance(data, dict) else None
+        if not isinstance(materials, dict) or not isinstance(tims, list):
+            return False, 'Nieprawidłowy format migawki materiałów'
+        with self.batch_notifications():
+            self.set_materials(materials)
+            self.set_tims(tims)
+        return True, f'Wczytano migawkę materiałów ({len(materials)} brył, {len(tims)} TIM-ów)'
@@ -0,0 +1,121 @@
+"""
+Observer pattern support shared by the UI-agnostic managers.
+"""
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+Observer = Callable[[str, dict], None]
+
+# Shared read-only payload for events sent without data
+_EMPTY = MappingProxyType({})
+
+
+class Observable:
+    """Base class for managers that publish (event_type, payload) notifications.
+
+    Subscribers are held in immutable tuples that are rebound on (un)subscribe,
+    so `_notify` iterates them directly instead of copying a list on every event.
+    A subscriber may name the events it wants; those are kept per event type and
+    never called for anything else.
+    Callbacks registered with `subscribe_safe` have their exceptions swallowed;
+    the try/except is only paid when at least one such callback exists.
+    """
+
+    def __init__(self):
+        self._observers: Tuple[Observer, ...] = ()  # subscribed to every event
+        self._by_event: Dict[str, Tuple[Observer, ...]] = {}
+        self._safe_observers: FrozenSet[Observer] = frozenset()
+        # Batching state: while depth > 0 events are parked (last payload per event type wins)
+        self._notify_depth = 0
+        self._pending: Dict[str, dict] = {}
+        self._bulk_requested = False
+
+    def subscribe(self, callback: Observer, events: Optional[Iterable[str]] = None):
+        """Subscribe to all events, or only to the event types listed in `events`."""
+        if events is None:
+            self._observers = self._observers + (callback,)
+            return
+        by_event = dict(self._by_event)
+        for event_type in events:
+            by_event[event_type] = by_event.get(event_type, ()) + (callback,)
+        self._by_event = by_event
+
+    def subscribe_safe(self, callback: Observer, events: Optional[Iterable[str]] = None):
+        """Subscribe a callback whose errors must not stop the notification chain."""
+        self._safe_observers = self._safe_observers | {callback}
+        self.subscribe(callback, events)
+
+    def unsubscribe(self, callback: Observer):
+        found = callback in self._observers
+        if found:
+            observers = list(self._observers)
+            observers.remove(callback)
+            self._observers = tuple(observers)
+        by_event = {}
+        for event_type, observers in self._by_event.items():
+            if callback in observers:
+                found = True
+                observers = tuple(cb for cb in observers if cb != callback)
+            if observers:
+                by_event[event_type] = observers
+        if not found:
+            return
+        self._by_event = by_event
+        if callback in self._safe_observers and not self._is_subscribed(callback):
+            self._safe_observers = self._safe_observers - {callback}
+
+    def _is_subscribed(self, callback: Observer) -> bool:
+        return callback in self._observers or any(callback in obs for obs in self._by_event.values())
+
+    @contextmanager
+    def batch_notifications(self):
+        """Coalesce notifications raised inside the block into one event per type, sent on exit."""
+        self._notify_depth += 1
+        try:
+            yield self
+        finally:
+            self._notify_depth -= 1
+            if self._notify_depth == 0:
+                bulk, self._bulk_requested = self._bulk_requested, False
+                if self._pending:
+                    pending, self._pending = self._pending, {}
+                    for event_type, payload in pending.items():
+                        self._dispatch(event_type, payload)
+                    if bulk:
+                        self._dispatch('bulk_changed', {'events': tuple(pending)})
+
+    @contextmanager
+    def batch(self):
+        """batch_notifications() for a multi-step change: the coalesced events are followed
+        by a single 'bulk_changed' event listing their types (only if anything was sent).
+        """
+        self._bulk_requested = True
+        with self.batch_notifications():
+            yield self
+
+    def _notify(self, event_type: str, data: Optional[dict] = None):
+        payload = data or _EMPTY
+        if self._notify_depth:
+            self._pending[event_type] = payload
+            return
+        self._dispatch(event_type, payload)
+
+    def _dispatch(self, event_type: str, payload: dict):
+        # The tuples are bound here; (un)subscribing from a callback only affects later events
+        targeted = self._by_event.get(event_type, ())
+        safe = self._safe_observers
+        for observers in (targeted, self._observers):
+            if not safe:
+                for cb in observers:
+                    cb(event_type, payload)
+                continue
+            for cb in observers:
+                if cb in safe:
+                    try:
+                        cb(event_type, payload)
+                    except Exception:
+                        # Do not stop notification chain on observer errors
+                        pass
+                else:
+                    cb(event_type, payload)
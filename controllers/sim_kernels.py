@@ -0,0 +1,84 @@
+"""
+Contact conductance correlations h_c [W/m^2K] (UI-agnostic).
+
+Scalar kernels take the unpacked effective surface parameters of one interface
+(k_s, m_s, sig_s, e_s, hc_soft, all SI) and a contact pressure P [Pa].
+The *_sweep variants evaluate a whole pressure column for one interface, checking
+the parameter preconditions and folding the constant prefactor only once.
+"""
+import math
+from typing import List, Sequence
+
+_SQRT2 = math.sqrt(2)
+
+
+# --- Scalar kernels ---
+def mikic_elastic(k_s, m_s, sig_s, e_s, hc_soft, P):
+    if sig_s > 0 and m_s > 0 and e_s > 0:
+        inner = (_SQRT2 * P) / (m_s * e_s)
+        if inner > 0:
+            return 1.54 * k_s * (m_s / sig_s) * (inner ** 0.94)
+    return 0.0
+
+
+def mikic_plastic(k_s, m_s, sig_s, e_s, hc_soft, P):
+    if sig_s > 0 and m_s > 0 and hc_soft > 0:
+        rel_p = P / hc_soft
+        if rel_p > 0:
+            return 1.13 * k_s * (m_s / sig_s) * (rel_p ** 0.94)
+    return 0.0
+
+
+def cmy(k_s, m_s, sig_s, e_s, hc_soft, P):
+    if sig_s > 0 and m_s > 0 and hc_soft > 0:
+        rel_p = P / hc_soft
+        if rel_p > 0:
+            return 1.45 * k_s * (m_s / sig_s) * (rel_p ** 0.985)
+    return 0.0
+
+
+def yovanovich(k_s, m_s, sig_s, e_s, hc_soft, P):
+    if sig_s > 0 and m_s > 0 and hc_soft > 0:
+        rel_p = P / hc_soft
+        if rel_p > 0:
+            return 1.25 * k_s * (m_s / sig_s) * (rel_p ** 0.95)
+    return 0.0
+
+
+# --- Column kernels (one interface, many pressures) ---
+# Every built-in model is C * k_s * (m_s / sig_s) * X**E, where X is the normalised pressure:
+# 'elastic' -> sqrt(2) * P / (m_s * e_s), 'plastic' -> P / hc_soft
+MODELS = {
+    'Mikic-Sprężyste': (1.54, 0.94, 'elastic'),
+    'Mikic-Plastyczne': (1.13, 0.94, 'plastic'),
+    'CMY': (1.45, 0.985, 'plastic'),
+    'Yovanovich': (1.25, 0.95, 'plastic'),
+}
+
+
+def make_sweep(C: float, E: float, basis: str):
+    """Build the column kernel of one model, with its constants bound in a closure."""
+    if basis == 'elastic':
+        def sweep(k_s, m_s, sig_s, e_s, hc_soft, pressures: Sequence[float]) -> List[float]:
+            if not (sig_s > 0 and m_s > 0 and e_s > 0):
+                return [0.0] * len(pressures)
+            coef = C * k_s * (m_s / sig_s)
+            me = m_s * e_s
+            xs = [(_SQRT2 * P) / me for P in pressures]
+            return [coef * (x ** E) if x > 0 else 0.0 for x in xs]
+    elif basis == 'plastic':
+        def sweep(k_s, m_s, sig_s, e_s, hc_soft, pressures: Sequence[float]) -> List[float]:
+            if not (sig_s > 0 and m_s > 0 and hc_soft > 0):
+                return [0.0] * len(pressures)
+            coef = C * k_s * (m_s / sig_s)
+            xs = [P / hc_soft for P in pressures]
+            return [coef * (x ** E) if x > 0 else 0.0 for x in xs]
+    else:
+        raise ValueError(f'Unknown pressure basis: {basis}')
+    return sweep
+
+
+mikic_elastic_sweep = make_sweep(*MODELS['Mikic-Sprężyste'])
+mikic_plastic_sweep = make_sweep(*MODELS['Mikic-Plastyczne'])
+cmy_sweep = make_sweep(*MODELS['CMY'])
+yovanovich_sweep = make_sweep(*MODELS['Yovanovich'])
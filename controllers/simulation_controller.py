@@ -1,32 +1,115 @@
 import os
 import math
-import csv
-from typing import Callable, Dict, List, Tuple, Optional
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
+from .csv_export import format_column, needs_quoting, write_csv
+from .observable import Observable
+from . import sim_kernels
+
+
+# Numeric columns of the per (interface, force) TCR results
+TCR_COLUMNS = ('force_N', 'pressure_Pa', 'pct_styku', 'pct_int', 'h_c', 'R_c',
+               'h_int', 'R_int', 'h_eff', 'TCR', 'K')
+# Row layout used for display
+TCR_ROW_KEYS = ('force_N', 'interface') + TCR_COLUMNS[1:]
+
+TCR_CSV_HEADERS = (
+    'Force[N]', 'Interface', 'ciśnienie [Pa]', '%styku', '%int',
+    'hc [W/m^2K]', 'Rc [K/W]', 'h_int[W/m^2K]', 'R_int [K/W]',
+    'h_eff [W/m^2K]', 'TCR [K/W]', 'K_warstwy'
+)
+Q_CSV_HEADERS = ('Force[N]', 'R_U [K/W]', 'TCRsum [K/W]', 'Q [W]')
+
+# Material table units -> SI
+SIGMA_SCALE = 1e-6  # µm -> m
+YOUNG_SCALE = 1e9   # GPa -> Pa
+HC_SCALE = 1e6      # MPa -> Pa
+
+# Resistance of a non-conducting path; exported as 'INF'
+_INF = float('inf')
+
+# Column kernels of the built-in models, keyed by the model names used in the UI
+MODEL_SWEEPS = {name: sim_kernels.make_sweep(*spec) for name, spec in sim_kernels.MODELS.items()}
+
+
+def _float_column():
+    return array('d')
+
+
+@dataclass
+class TCRResults:
+    """TCR results stored column-wise: one float array per quantity plus interface names."""
+    interface: List[str] = field(default_factory=list)
+    force_N: array = field(default_factory=_float_column)
+    pressure_Pa: array = field(default_factory=_float_column)
+    pct_styku: array = field(default_factory=_float_column)
+    pct_int: array = field(default_factory=_float_column)
+    h_c: array = field(default_factory=_float_column)
+    R_c: array = field(default_factory=_float_column)
+    h_int: array = field(default_factory=_float_column)
+    R_int: array = field(default_factory=_float_column)
+    h_eff: array = field(default_factory=_float_column)
+    TCR: array = field(default_factory=_float_column)
+    K: array = field(default_factory=_float_column)
+
+    def __len__(self):
+        return len(self.force_N)
+
+    def extend(self, interface_name: str, **columns):
+        """Append one interface's columns (all of equal length, keyed by TCR_COLUMNS)."""
+        self.interface.extend([interface_name] * len(columns['force_N']))
+        for key in TCR_COLUMNS:
+            getattr(self, key).extend(columns[key])
+
+    def rows(self) -> Iterator[dict]:
+        """Row view (dict per interface/force pair) for display."""
+        cols = [getattr(self, key) for key in TCR_ROW_KEYS]
+        for values in zip(*cols):
+            yield dict(zip(TCR_ROW_KEYS, values))
+
+
+_MATERIAL_ROW_FIELDS = ('k', 'young', 'poisson', 'sigma', 'm', 'hc')
+
+
+@dataclass(slots=True)
+class MaterialRow:
+    """Numeric material parameters of one geometry, in material table units."""
+    k: float = 0.0
+    young: float = 0.0
+    poisson: float = 0.0
+    sigma: float = 0.0
+    m: float = 0.0
+    hc: float = 0.0
+
+    @classmethod
+    def from_entry(cls, entry: dict) -> Optional['MaterialRow']:
+        """Coerce a materials table entry (missing fields -> 0); None if a field is not a number."""
+        try:
+            return cls(*(float(entry.get(key, 0)) for key in _MATERIAL_ROW_FIELDS))
+        except (TypeError, ValueError):
+            return None
+
+
+# Geometry without a materials entry
+_EMPTY_MATERIAL = MaterialRow()
 
 
-class SimulationManager:
+class SimulationManager(Observable):
     """Business logic for simulation calculations (UI-agnostic)."""
 
     def __init__(self, app=None):
+        super().__init__()
         self.app = app
-        self._observers = []
         self.geometries = []
         self.interfaces = []
         self.materials: Dict[str, Dict[str, float]] = {}
         self.tims: List[Dict[str, object]] = []
         self.forces: List[float] = []
-
-    # Observer pattern (not heavily used yet)
-    def subscribe(self, cb: Callable[[str, dict], None]):
-        self._observers.append(cb)
-
-    def _notify(self, event_type: str, data: Optional[dict] = None):
-        payload = data or {}
-        for cb in list(self._observers):
-            try:
-                cb(event_type, payload)
-            except Exception:
-                pass
+        # Effective interface parameters, valid for the current context only
+        self._iface_params_cache: Dict[object, Optional[dict]] = {}
+        self._tcr_interfaces: List[object] = []
+        self._material_rows: Dict[str, Optional[MaterialRow]] = {}
 
     # Context setters
     def set_context(self, geometries, interfaces, materials, tims, forces: List[float]):
@@ -35,40 +118,51 @@ class SimulationManager:
         self.materials = materials or {}
         self.tims = tims or []
         self.forces = forces or []
+        self._iface_params_cache = {}
+        self._material_rows = {name: MaterialRow.from_entry(entry) for name, entry in self.materials.items()}
+        self._tcr_interfaces = [i for i in self.interfaces if getattr(i, 'has_tcr', False)]
         self._notify('sim_context_set', {'geoms': len(self.geometries), 'interfaces': len(self.interfaces)})
 
     # Interface params (SI units)
     def get_interface_params(self, iface) -> Optional[dict]:
+        """Effective parameters of an interface, memoized until the next set_context()."""
+        try:
+            return self._iface_params_cache[iface]
+        except KeyError:
+            params = self._iface_params_cache[iface] = self._compute_interface_params(iface)
+            return params
+
+    def _compute_interface_params(self, iface) -> Optional[dict]:
         name_top = iface.geom_top.name
         name_bottom = iface.geom_bottom.name
-        mat_top = self.materials.get(name_top, {})
-        mat_bottom = self.materials.get(name_bottom, {})
+        top = self._material_rows.get(name_top, _EMPTY_MATERIAL)
+        bottom = self._material_rows.get(name_bottom, _EMPTY_MATERIAL)
+        if top is None or bottom is None:
+            # A material field of one of the sides is not a number
+            return None
 
         try:
-            def get_val(d, k, scale=1.0):
-                return float(d.get(k, 0)) * scale
+            sig_1 = top.sigma * SIGMA_SCALE
+            sig_2 = bottom.sigma * SIGMA_SCALE
+            sig_s = math.hypot(sig_1, sig_2)
 
-            sig_1 = get_val(mat_top, 'sigma', 1e-6)
-            sig_2 = get_val(mat_bottom, 'sigma', 1e-6)
-            sig_s = math.sqrt(sig_1**2 + sig_2**2)
+            m_1 = top.m
+            m_2 = bottom.m
+            m_s = math.hypot(m_1, m_2)
 
-            m_1 = get_val(mat_top, 'm')
-            m_2 = get_val(mat_bottom, 'm')
-            m_s = math.sqrt(m_1**2 + m_2**2)
-
-            k_1 = get_val(mat_top, 'k')
-            k_2 = get_val(mat_bottom, 'k')
+            k_1 = top.k
+            k_2 = bottom.k
             k_s = (2 * k_1 * k_2) / (k_1 + k_2) if (k_1 + k_2) > 0 else 0
 
-            e_1 = get_val(mat_top, 'young', 1e9)
-            e_2 = get_val(mat_bottom, 'young', 1e9)
-            v_1 = get_val(mat_top, 'poisson')
-            v_2 = get_val(mat_bottom, 'poisson')
-            denom = e_2 * (1 - v_1**2) + e_1 * (1 - v_2**2)
+            e_1 = top.young * YOUNG_SCALE
+            e_2 = bottom.young * YOUNG_SCALE
+            v_1 = top.poisson
+            v_2 = bottom.poisson
+            denom = e_2 * (1 - v_1 * v_1) + e_1 * (1 - v_2 * v_2)
             e_s = (e_1 * e_2) / denom if denom > 0 else 0
 
-            hc_1 = get_val(mat_top, 'hc', 1e6)
-            hc_2 = get_val(mat_bottom, 'hc', 1e6)
+            hc_1 = top.hc * HC_SCALE
+            hc_2 = bottom.hc * HC_SCALE
             valid_hcs = [h for h in (hc_1, hc_2) if h > 0]
             hc_soft = min(valid_hcs) if valid_hcs else 0
 
@@ -84,48 +178,31 @@ class SimulationManager:
         except Exception:
             return None
 
-    # Model kernels
+    # Model kernels (see sim_kernels)
+    @staticmethod
+    def _kernel_args(params):
+        return params['k_s'], params['m_s'], params['sig_s'], params['e_s'], params['hc_soft']
+
     @staticmethod
     def calc_mikic_elastic(params, P):
-        k_s, m_s, sig_s, e_s = params['k_s'], params['m_s'], params['sig_s'], params['e_s']
-        if sig_s > 0 and m_s > 0 and e_s > 0:
-            inner = (math.sqrt(2) * P) / (m_s * e_s)
-            if inner > 0:
-                return 1.54 * k_s * (m_s / sig_s) * (inner ** 0.94)
-        return 0.0
+        return sim_kernels.mikic_elastic(*SimulationManager._kernel_args(params), P)
 
     @staticmethod
     def calc_mikic_plastic(params, P):
-        k_s, m_s, sig_s, hc = params['k_s'], params['m_s'], params['sig_s'], params['hc_soft']
-        if sig_s > 0 and m_s > 0 and hc > 0:
-            rel_p = P / hc
-            if rel_p > 0:
-                return 1.13 * k_s * (m_s / sig_s) * (rel_p ** 0.94)
-        return 0.0
+        return sim_kernels.mikic_plastic(*SimulationManager._kernel_args(params), P)
 
     @staticmethod
     def calc_cmy(params, P):
-        k_s, m_s, sig_s, hc = params['k_s'], params['m_s'], params['sig_s'], params['hc_soft']
-        if sig_s > 0 and m_s > 0 and hc > 0:
-            rel_p = P / hc
-            if rel_p > 0:
-                return 1.45 * k_s * (m_s / sig_s) * (rel_p ** 0.985)
-        return 0.0
+        return sim_kernels.cmy(*SimulationManager._kernel_args(params), P)
 
     @staticmethod
     def calc_yovanovich(params, P):
-        k_s, m_s, sig_s, hc = params['k_s'], params['m_s'], params['sig_s'], params['hc_soft']
-        if sig_s > 0 and m_s > 0 and hc > 0:
-            rel_p = P / hc
-            if rel_p > 0:
-                return 1.25 * k_s * (m_s / sig_s) * (rel_p ** 0.95)
-        return 0.0
+        return sim_kernels.yovanovich(*SimulationManager._kernel_args(params), P)
 
     # Report: microsurface
     def microsurface_report(self) -> List[dict]:
         data = []
-        tcr_ifaces = [i for i in self.interfaces if getattr(i, 'has_tcr', False)]
-        for iface in tcr_ifaces:
+        for iface in self._tcr_interfaces:
             p = self.get_interface_params(iface)
             if p:
                 data.append(p)
@@ -134,92 +211,99 @@ class SimulationManager:
     # Main simulation runner
     def run_model(self, model_name: str, calc_func: Callable, interface_configs: dict, thot: float, tcold: float):
         if not interface_configs:
-            return False, 'Brak skonfigurowanych interfejsów.', [], []
+            return False, 'Brak skonfigurowanych interfejsów.', TCRResults(), []
         if not self.forces:
-            return False, 'Brak zdefiniowanych sił w systemie.', [], []
+            return False, 'Brak zdefiniowanych sił w systemie.', TCRResults(), []
 
-        results_tcr = []
-        iface_tcr_accumulation = {}
+        forces = self.forces
+        inf = _INF
+        sweep = MODEL_SWEEPS.get(model_name)
+        results_tcr = TCRResults()
+        iface_tcr_accumulation: Dict[str, array] = {}
 
+        # Interface-major: every quantity is evaluated as one column over all forces,
+        # so per-interface invariants (params, TIM lookup, A_nom) are resolved once.
         for iface_idx, cfg in interface_configs.items():
             iface = cfg['interface']
             params = self.get_interface_params(iface)
             if not params:
                 continue
+            A_nom = params['A_nom']
+            if A_nom <= 0:
+                continue
+            hc_soft = params['hc_soft']
 
             tim_name = cfg['tim_var'].get()
             selected_tim = next((t for t in self.tims if t.get('name') == tim_name), None)
-
             user_blt_str = cfg['thickness_entry'].get().replace(',', '.')
-            is_gas = (selected_tim.get('type') == 'gas') if selected_tim else False
-            is_press_dep = selected_tim.get('pressure_dependent', False) if selected_tim else False
 
-            for force_val in self.forces:
-                A_nom = params['A_nom']
-                if A_nom <= 0:
-                    continue
-                Pressure = force_val / A_nom
-
-                h_c = calc_func(params, Pressure)
+            pressures = [f / A_nom for f in forces]
+            if sweep is not None:
+                h_c_col = sweep(*self._kernel_args(params), pressures)
+            else:
+                h_c_col = [calc_func(params, P) for P in pressures]
+            h_int_col = self._gap_conductance(selected_tim, params, pressures, user_blt_str)
+            if hc_soft > 0:
+                pct_styku_col = [min(100.0, (P / hc_soft) * 100.0) for P in pressures]
+            else:
+                pct_styku_col = [0.0] * len(pressures)
+
+            h_eff_col = [h_c + h_int for h_c, h_int in zip(h_c_col, h_int_col)]
+            tcr_col = [1.0 / (h * A_nom) if h > 0 else inf for h in h_eff_col]
+
+            name = params['name']
+            results_tcr.extend(
+                name,
+                force_N=forces,
+                pressure_Pa=pressures,
+                pct_styku=pct_styku_col,
+                pct_int=[100.0 - pct for pct in pct_styku_col],
+                h_c=h_c_col,
+                R_c=[1.0 / (h * A_nom) if h > 0 else inf for h in h_c_col],
+                h_int=h_int_col,
+                R_int=[1.0 / (h * A_nom) if h > 0 else inf for h in h_int_col],
+                h_eff=h_eff_col,
+                TCR=tcr_col,
+                K=[0.0001 / (tcr * A_nom) if h > 0 else 0.0 for h, tcr in zip(h_eff_col, tcr_col)],
+            )
+            # TCR column (packed doubles) aligned with `forces`; the first interface of a given name wins
+            if name not in iface_tcr_accumulation:
+                iface_tcr_accumulation[name] = array('d', tcr_col)
+
+        results_q = self._calculate_system_q(forces, iface_tcr_accumulation, thot, tcold)
+        return True, 'OK', results_tcr, results_q
 
+    @staticmethod
+    def _gap_conductance(selected_tim, params, pressures, user_blt_str) -> List[float]:
+        """Interstitial (TIM) conductance h_int for each pressure of a single interface."""
+        if not selected_tim:
+            return [0.0] * len(pressures)
+        k_tim = float(selected_tim.get('k', 0))
+        is_gas = selected_tim.get('type') == 'gas'
+        if is_gas and selected_tim.get('pressure_dependent', False):
+            # Gap thickness follows the contact pressure (Antonetti correlation)
+            hc_soft = params['hc_soft']
+            sig_s = params['sig_s']
+            if hc_soft <= 0 or sig_s <= 0:
+                return [0.0] * len(pressures)
+            col = []
+            for P in pressures:
                 h_int = 0.0
-                if selected_tim:
-                    k_tim = float(selected_tim.get('k', 0))
-                    if is_gas and is_press_dep:
-                        hc_soft = params['hc_soft']
-                        sig_s = params['sig_s']
-                        if hc_soft > 0 and sig_s > 0 and Pressure > 0:
-                            try:
-                                delta = 1.53 * sig_s * ((Pressure / hc_soft) ** -0.097)
-                                if delta > 0:
-                                    h_int = k_tim / delta
-                            except Exception:
-                                h_int = 0.0
-                    else:
-                        try:
-                            blt_val = float(user_blt_str)
-                            if blt_val > 0:
-                                h_int = k_tim / blt_val
-                        except ValueError:
-                            h_int = 0.0
-
-                h_eff = h_c + h_int
-                R_c = 1.0 / (h_c * A_nom) if h_c > 0 else float('inf')
-                R_int = 1.0 / (h_int * A_nom) if h_int > 0 else float('inf')
-
-                pct_styku = 0.0
-                if params['hc_soft'] > 0:
-                    pct_styku = min(100.0, (Pressure / params['hc_soft']) * 100.0)
-                pct_int = 100.0 - pct_styku
-
-                if h_eff > 0:
-                    R_eff = 1.0 / (h_eff * A_nom)
-                    TCR = R_eff
-                    K_eff = 0.0001 / (TCR * A_nom)
-                else:
-                    R_eff = float('inf')
-                    TCR = float('inf')
-                    K_eff = 0.0
-
-                results_tcr.append({
-                    'force_N': force_val,
-                    'interface': params['name'],
-                    'pressure_Pa': Pressure,
-                    'pct_styku': pct_styku,
-                    'pct_int': pct_int,
-                    'h_c': h_c,
-                    'R_c': R_c,
-                    'h_int': h_int,
-                    'R_int': R_int,
-                    'h_eff': h_eff,
-                    'TCR': TCR,
-                    'K': K_eff
-                })
-
-                iface_tcr_accumulation.setdefault(params['name'], []).append({'force': force_val, 'R_val': TCR})
-
-        results_q = self._calculate_system_q(self.forces, iface_tcr_accumulation, thot, tcold)
-        return True, 'OK', results_tcr, results_q
+                if P > 0:
+                    delta = 1.53 * sig_s * ((P / hc_soft) ** -0.097)
+                    if delta > 0:
+                        h_int = k_tim / delta
+                col.append(h_int)
+            return col
+        # Fixed BLT / gap: the same conductance for every force
+        h_int = 0.0
+        try:
+            blt_val = float(user_blt_str)
+            if blt_val > 0:
+                h_int = k_tim / blt_val
+        except ValueError:
+            h_int = 0.0
+        return [h_int] * len(pressures)
 
     def _calculate_system_q(self, forces, tcr_data, thot, tcold):
         geoms = self.geometries or []
@@ -234,22 +318,18 @@ class SimulationManager:
             except Exception:
                 pass
 
-        q_rows = []
+        # One R column per interface, aligned with `forces`; walk them force by force.
+        # All resistances are >= 0, so a force's total is INF exactly when one interface is.
+        R_columns = list(tcr_data.values())
+        per_force = zip(*R_columns) if R_columns else [()] * len(forces)
         dT = abs(thot - tcold)
-        for f in forces:
-            sum_R_interface = 0.0
-            valid = True
-            found_interfaces = 0
-            for iface_name, entries in tcr_data.items():
-                entry = next((e for e in entries if abs(e['force'] - f) < 1e-9), None)
-                if entry:
-                    if entry['R_val'] == float('inf'):
-                        valid = False
-                    else:
-                        sum_R_interface += entry['R_val']
-                    found_interfaces += 1
-            if not valid or found_interfaces == 0:
-                R_total = float('inf')
+        q_rows = []
+        for f, R_vals in zip(forces, per_force):
+            sum_R_interface = sum(R_vals, 0.0)
+            if not R_vals or sum_R_interface == _INF:
+                # Report the finite part only, as before
+                sum_R_interface = sum((R for R in R_vals if R != _INF), 0.0)
+                R_total = _INF
                 Q = 0.0
             else:
                 R_total = R_bulk_total + sum_R_interface
@@ -264,43 +344,49 @@ class SimulationManager:
             })
         return q_rows
 
-    def export_results(self, model_name: str, tcr_rows: List[dict], q_rows: List[dict]):
+    def export_results(self, model_name: str, results: TCRResults, q_rows: List[dict], safe: bool = False):
         tag = model_name.lower().replace(' ', '_').replace('-', '_')
         output_dir = os.path.join(os.getcwd(), 'results', tag)
         os.makedirs(output_dir, exist_ok=True)
         path_tcr = os.path.join(output_dir, "TCR.csv")
         path_q = os.path.join(output_dir, "Q.csv")
 
+        # Everything except interface names is numeric; quote only if a name requires it
+        safe = safe or any(needs_quoting(name) for name in set(results.interface))
+
         try:
-            with open(path_tcr, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                headers = [
-                    'Force[N]', 'Interface', 'ciśnienie [Pa]', '%styku', '%int',
-                    'hc [W/m^2K]', 'Rc [K/W]', 'h_int[W/m^2K]', 'R_int [K/W]',
-                    'h_eff [W/m^2K]', 'TCR [K/W]', 'K_warstwy'
-                ]
-                writer.writerow(headers)
-                for r in tcr_rows:
-                    writer.writerow([
-                        r['force_N'], r['interface'], f"{r['pressure_Pa']:.4f}", f"{r['pct_styku']:.2f}", f"{r['pct_int']:.2f}",
-                        f"{r['h_c']:.4f}", (f"{r['R_c']:.4f}" if r['R_c'] != float('inf') else 'INF'),
-                        f"{r['h_int']:.4f}", (f"{r['R_int']:.4f}" if r['R_int'] != float('inf') else 'INF'),
-                        f"{r['h_eff']:.4f}", (f"{r['TCR']:.4f}" if r['TCR'] != float('inf') else 'INF'), f"{r['K']:.4f}"
-                    ])
+            write_csv(path_tcr, TCR_CSV_HEADERS, self._tcr_csv_rows(results), safe=safe)
         except Exception as e:
             self._notify('export_error', {'target': 'TCR', 'error': str(e)})
 
         try:
-            with open(path_q, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                headers = ['Force[N]', 'R_U [K/W]', 'TCRsum [K/W]', 'Q [W]']
-                writer.writerow(headers)
-                for r in q_rows:
-                    writer.writerow([
-                        r['force_N'], f"{r['R_U']:.4f}", f"{r['TCRsum']:.4f}", f"{r['Q']:.4f}"
-                    ])
+            q_csv_rows = zip(
+                [str(r['force_N']) for r in q_rows],
+                format_column('.4f', [r['R_U'] for r in q_rows]),
+                format_column('.4f', [r['TCRsum'] for r in q_rows]),
+                format_column('.4f', [r['Q'] for r in q_rows]),
+            )
+            write_csv(path_q, Q_CSV_HEADERS, q_csv_rows, safe=safe)
         except Exception as e:
             self._notify('export_error', {'target': 'Q', 'error': str(e)})
 
         self._notify('export_done', {'path_tcr': path_tcr, 'path_q': path_q})
         return path_tcr, path_q
+
+    @staticmethod
+    def _tcr_csv_rows(results: TCRResults) -> Iterator[Tuple[str, ...]]:
+        # Formatted column by column, then zipped into rows
+        return zip(
+            map(str, results.force_N),
+            results.interface,
+            format_column('.4f', results.pressure_Pa),
+            format_column('.2f', results.pct_styku),
+            format_column('.2f', results.pct_int),
+            format_column('.4f', results.h_c),
+            format_column('.4f', results.R_c, inf_text='INF'),
+            format_column('.4f', results.h_int),
+            format_column('.4f', results.R_int, inf_text='INF'),
+            format_column('.4f', results.h_eff),
+            format_column('.4f', results.TCR, inf_text='INF'),
+            format_column('.4f', results.K),
+        )
@@ -1,64 +1,69 @@
+import copy
 import os
-from typing import Callable, List, Tuple, Optional
+import re
+from typing import Dict, List, Tuple, Optional
 from models import Geometry, Interface
+from .observable import Observable
 
+_IO_BUFFER = 1 << 20
 
-class SystemManager:
+_NUMBER = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+# One stripped geometry line: name, length, width, height (extra columns are ignored)
+_GEOM_LINE_RE = re.compile(
+    r'^(\S+)[^\S\n]+(' + _NUMBER + r')[^\S\n]+(' + _NUMBER + r')[^\S\n]+(' + _NUMBER + r')(?:[^\S\n].*)?$',
+    re.MULTILINE)
+
+
+class SystemManager(Observable):
     """Business logic (controller) for system geometries and interfaces.
-    Does not depend on UI. Implements simple Observer pattern.
+    Does not depend on UI. Publishes events through the Observable base.
     """
 
     def __init__(self, app=None):
-        self._observers: List[Callable[[str, dict], None]] = []
+        super().__init__()
         self.geometries: List[Geometry] = []
         self.interfaces: List[Interface] = []
+        # geometry name -> position in self.geometries
+        self._name_index: Dict[str, int] = {}
+        # (top name, bottom name) -> Interface, for every entry of self.interfaces
+        self._iface_map: Dict[Tuple[str, str], Interface] = {}
         self.app = app  # Optional, used only for logging convenience if needed
 
-    # --- Observer API ---
-    def subscribe(self, callback: Callable[[str, dict], None]):
-        self._observers.append(callback)
-
-    def unsubscribe(self, callback: Callable[[str, dict], None]):
-        try:
-            self._observers.remove(callback)
-        except ValueError:
-            pass
-
-    def _notify(self, event_type: str, data: Optional[dict] = None):
-        payload = data or {}
-        for cb in list(self._observers):
-            try:
-                cb(event_type, payload)
-            except Exception:
-                # Do not stop notification chain on observer errors
-                pass
-
     # --- Helpers ---
     def _name_exists(self, name: str, exclude_index: Optional[int] = None) -> bool:
-        for i, g in enumerate(self.geometries):
-            if exclude_index is not None and i == exclude_index:
-                continue
-            if g.name == name:
-                return True
-        return False
+        idx = self._name_index.get(name)
+        return idx is not None and idx != exclude_index
+
+    def _reindex_names(self, start: int = 0):
+        """Refresh name -> position for geometries from `start` on (positions before it are unchanged)."""
+        index = self._name_index
+        for i in range(start, len(self.geometries)):
+            index[self.geometries[i].name] = i
 
     # --- Public API: mutations ---
     def add_geometry(self, geometry: Geometry, index: Optional[int] = None) -> Tuple[bool, str]:
         if self._name_exists(geometry.name):
             return False, f'Bryła "{geometry.name}" już istnieje. Zmień nazwę.'
-        if index is None:
-            self.geometries.append(geometry)
-        else:
-            self.geometries.insert(index, geometry)
-        self.rebuild_interfaces()
-        self._notify('geometry_added', {'geometry': geometry})
+        with self.batch():
+            if index is None:
+                self.geometries.append(geometry)
+                self._name_index[geometry.name] = len(self.geometries) - 1
+            else:
+                self.geometries.insert(index, geometry)
+                self._reindex_names(min(index, len(self.geometries) - 1) if index >= 0 else 0)
+            pos = self._name_index[geometry.name]
+            self._splice_interfaces(pos - 1, pos + 1)
+            self._notify('geometry_added', {'geometry': geometry})
         return True, f'Dodano Geometrię: {geometry.name} (a={geometry.length}, b={geometry.width}, h={geometry.height})'
 
     def remove_geometry(self, index: int) -> Tuple[bool, str]:
         if 0 <= index < len(self.geometries):
-            removed = self.geometries.pop(index)
-            self.rebuild_interfaces()
-            self._notify('geometry_removed', {'geometry': removed})
+            with self.batch():
+                removed = self.geometries.pop(index)
+                del self._name_index[removed.name]
+                self._reindex_names(index)
+                self._splice_interfaces(index - 1, index)
+                self._notify('geometry_removed', {'geometry': removed})
             return True, f'Usunięto Geometrię: {removed.name}'
         return False, 'Nieprawidłowy indeks bryły'
 
@@ -67,9 +72,14 @@ class SystemManager:
             return False, 'Nieprawidłowy indeks bryły'
         if self._name_exists(geometry.name, exclude_index=index):
             return False, f'Bryła "{geometry.name}" już istnieje. Zmień nazwę.'
-        self.geometries[index] = geometry
-        self.rebuild_interfaces()
-        self._notify('geometry_updated', {'index': index, 'geometry': geometry})
+        with self.batch():
+            old_name = self.geometries[index].name
+            if old_name != geometry.name:
+                del self._name_index[old_name]
+                self._name_index[geometry.name] = index
+            self.geometries[index] = geometry
+            self._splice_interfaces(index - 1, index + 1)
+            self._notify('geometry_updated', {'index': index, 'geometry': geometry})
         return True, f'Edytowano Geometrię: {geometry.name} (a={geometry.length}, b={geometry.width}, h={geometry.height})'
 
     def set_tcr_flag(self, interface_index: int, value: bool) -> Tuple[bool, str]:
@@ -86,60 +96,105 @@ class SystemManager:
 
     # --- Public API: structure ---
     def rebuild_interfaces(self) -> Tuple[bool, str]:
-        old_interfaces = {(g.geom_top.name, g.geom_bottom.name): g.has_tcr
-                          for g in self.interfaces if isinstance(g, Interface)}
-        current_names = {g.name for g in self.geometries}
-
-        new_keys = []
-        new_interfaces: List[Interface] = []
-        for i in range(len(self.geometries) - 1):
-            geom_top = self.geometries[i]
-            geom_bottom = self.geometries[i + 1]
+        with self.batch():
+            self._splice_interfaces(0, len(self.geometries) - 1)
+        return True, 'Interfejsy przebudowane'
+
+    def _splice_interfaces(self, lo: int, hi: int):
+        """Recreate the interfaces at positions [lo, hi) of the new adjacency list after a geometry edit.
+
+        Interfaces outside that range keep their objects, and so does one inside it whose
+        two geometry objects are unchanged; otherwise has_tcr carries over from an evicted
+        interface with the same (top, bottom) names.
+        """
+        geoms = self.geometries
+        count = max(len(geoms) - 1, 0)
+        lo = max(lo, 0)
+        hi = min(hi, count)
+        if hi < lo:
+            hi = lo
+        # Matching range in the current list (it differs in length by the number of added/removed interfaces)
+        hi_old = hi - (count - len(self.interfaces))
+
+        evicted: Dict[Tuple[str, str], Interface] = {}
+        for it in self.interfaces[lo:hi_old]:
+            key = (it.geom_top.name, it.geom_bottom.name)
+            evicted[key] = it
+            self._iface_map.pop(key, None)
+
+        fresh: List[Interface] = []
+        for i in range(lo, hi):
+            geom_top = geoms[i]
+            geom_bottom = geoms[i + 1]
             key = (geom_top.name, geom_bottom.name)
-            new_keys.append(key)
-            has_tcr = old_interfaces.get(key, False)
-            new_interfaces.append(Interface(geom_top, geom_bottom, has_tcr))
+            old = evicted.get(key)
+            if old is not None and old.geom_top is geom_top and old.geom_bottom is geom_bottom:
+                iface = old  # same geometry objects: nothing to recompute
+            else:
+                iface = Interface(geom_top, geom_bottom, old.has_tcr if old is not None else False)
+            self._iface_map[key] = iface
+            fresh.append(iface)
 
-        removed_tcrs = [k for k, v in old_interfaces.items() if v and k not in new_keys]
-        self.interfaces = new_interfaces
+        removed_tcrs = [k for k, it in evicted.items() if it.has_tcr and k not in self._iface_map]
+        # New list object, so lists handed out earlier (e.g. a saved system) stay unchanged
+        self.interfaces = self.interfaces[:lo] + fresh + self.interfaces[hi_old:]
         self._notify('interfaces_rebuilt', {'removed_tcrs': removed_tcrs})
-        return True, 'Interfejsy przebudowane'
 
     # --- Public API: validation ---
-    def validate_system(self) -> Tuple[bool, str]:
+    def validate_system(self, fast: bool = False) -> Tuple[bool, str]:
+        """Check every geometry; with fast=True stop at (and report) the first invalid one."""
         if not self.geometries:
             return False, 'Zdefiniuj przynajmniej jedną bryłę'
-        invalid = [g for g in self.geometries if not g.is_valid()]
-        if invalid:
-            names = ', '.join(g.name for g in invalid)
-            return False, f'Nieprawidłowe bryły: {names}'
+        invalid_names = []
+        for g in self.geometries:
+            if not g.is_valid():
+                invalid_names.append(g.name)
+                if fast:
+                    break
+        if invalid_names:
+            return False, f'Nieprawidłowe bryły: {", ".join(invalid_names)}'
         return True, 'System poprawny'
 
     # --- Import/Export ---
     def import_from_file(self, file_path: str) -> Tuple[bool, str]:
         try:
-            with open(file_path, 'r') as f:
-                lines = [line.strip() for line in f if line.strip()]
-            geometries: List[Geometry] = []
-            for i, line in enumerate(lines):
-                parts = line.split()
-                if len(parts) < 4:
-                    return False, f'Invalid format at line {i+1}'
-                try:
-                    name = parts[0]
-                    length = float(parts[1])
-                    width = float(parts[2])
-                    height = float(parts[3])
-                    geometries.append(Geometry(name, length, width, height))
-                except ValueError:
-                    return False, f'Invalid numbers at line {i+1}'
-            names = [g.name for g in geometries]
-            if len(names) != len(set(names)):
-                duplicates = [n for n in set(names) if names.count(n) > 1]
+            with open(file_path, 'r', buffering=_IO_BUFFER) as f:
+                data = f.read()
+            lines = [s for s in map(str.strip, data.splitlines()) if s]
+            # One regex pass over the whole file; if any line does not match, the
+            # per-line parse below finds it (and accepts what float() still takes)
+            rows = _GEOM_LINE_RE.findall('\n'.join(lines))
+            if len(rows) == len(lines):
+                geometries = [Geometry(name, float(length), float(width), float(height))
+                              for name, length, width, height in rows]
+            else:
+                geometries: List[Geometry] = []
+                for i, line in enumerate(lines):
+                    parts = line.split()
+                    if len(parts) < 4:
+                        return False, f'Invalid format at line {i+1}'
+                    try:
+                        name = parts[0]
+                        length = float(parts[1])
+                        width = float(parts[2])
+                        height = float(parts[3])
+                        geometries.append(Geometry(name, length, width, height))
+                    except ValueError:
+                        return False, f'Invalid numbers at line {i+1}'
+            seen: Dict[str, int] = {}
+            duplicates: Dict[str, None] = {}  # ordered set
+            for i, g in enumerate(geometries):
+                if g.name in seen:
+                    duplicates[g.name] = None
+                else:
+                    seen[g.name] = i
+            if duplicates:
                 return False, f'Nieprawidłowe dane: dwie bryły o takich samych nazwach: {", ".join(duplicates)}'
-            self.geometries = geometries
-            self.rebuild_interfaces()
-            self._notify('imported', {'count': len(geometries), 'file': os.path.basename(file_path)})
+            with self.batch():
+                self.geometries = geometries
+                self._name_index = seen
+                self.rebuild_interfaces()
+                self._notify('imported', {'count': len(geometries), 'file': os.path.basename(file_path)})
             return True, f'Imported {len(geometries)} geometries'
         except Exception as e:
             return False, f'Failed to import: {str(e)}'
@@ -148,17 +203,21 @@ class SystemManager:
         if not self.geometries:
             return False, 'No geometries to export'
         try:
-            with open(file_path, 'w') as f:
-                for geom in self.geometries:
-                    f.write(f'{geom.name}\t{geom.length}\t{geom.width}\t{geom.height}\n')
+            payload = ''.join(f'{geom.name}\t{geom.length}\t{geom.width}\t{geom.height}\n'
+                              for geom in self.geometries)
+            with open(file_path, 'w', buffering=_IO_BUFFER) as f:
+                f.write(payload)
             self._notify('exported', {'file': os.path.basename(file_path)})
             return True, f'Exported to {os.path.basename(file_path)}'
         except Exception as e:
             return False, f'Failed to export: {str(e)}'
 
     # --- Accessors ---
-    def get_geometries(self) -> List[Geometry]:
-        return self.geometries
-
-    def get_interfaces(self) -> List[Interface]:
-        return self.interfaces
+    # Readers use .geometries / .interfaces directly; treat them as read-only views.
+    def geometries_snapshot(self) -> List[Geometry]:
+        """Copy of the geometry list, for callers that keep it beyond the next mutation."""
+        return self.geometries.copy()
+
+    def interfaces_snapshot(self) -> List[Interface]:
+        """Copies of the interfaces: the manager reuses its Interface objects and flips has_tcr in place."""
+        return [copy.copy(it) for it in self.interfaces]
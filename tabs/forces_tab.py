@@ -5,7 +5,16 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
 from controllers import ForcesManager
+from controllers.forces_controller import report_columns
+from controllers.csv_export import format_column
+from widgets import Debouncer, ScrollableTable, run_in_background
+
+# Fixed pixel height of one force row in the virtualized list
+_ROW_HEIGHT = 26
+# Reports up to this many rows are shown right away; larger ones on 'Show Table'
+_REPORT_AUTO_ROWS = 2000
 
 
 class ForcesTab(ttk.Frame):
@@ -14,11 +23,17 @@ class ForcesTab(ttk.Frame):
         self.app = app
 
         # Manager for business logic
+        # UI redraws are driven by explicit calls; no manager subscription needed
         self.manager = ForcesManager(app=self.app)
-        self.manager.subscribe(self._on_manager_event)
 
-        # View state
-        self.force_widgets = {}  # idx -> entry widget for force value
+        # View state: the text of every force row is kept in _values; only the rows in view
+        # have an Entry, taken from a small pool that is re-pointed at other rows on scroll
+        self._values = []
+        self._pool = []       # ttk.Entry widgets, enough to cover the canvas height
+        self._pool_vars = []  # StringVar behind each pooled Entry
+        self._pool_rows = []  # force index shown by each pooled Entry (-1 = unused)
+        # File reading/writing runs here; results are applied on the Tk thread
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
 
         # Header / controls
         frm_top = ttk.Frame(self)
@@ -36,21 +51,38 @@ class ForcesTab(ttk.Frame):
         ttk.Button(frm_buttons, text='Clear All', command=self._clear_all_forces).pack(side='left', padx=4)
         ttk.Button(frm_buttons, text='Generate Report', command=self._generate_report).pack(side='left', padx=4)
 
-        # Scrollable area for forces list
+        # Scrollable area for forces list; built once, rows are rendered on demand
         self.container = ttk.Frame(self)
         self.container.pack(fill='both', expand=True, padx=10, pady=10)
 
+        self.lbl_empty = ttk.Label(self.container, text='(brak zdefiniowanych sił)')
+        # Header
+        self._header = ttk.Frame(self.container)
+        ttk.Label(self._header, text='Siła [N]', font=('', 9, 'bold')).pack(side='left', padx=4, pady=4)
+
+        self._canvas = tk.Canvas(self.container)
+        self._vsb = ttk.Scrollbar(self.container, orient='vertical', command=self._canvas.yview)
+        # Every view change (scrollbar, yview_moveto, resize) goes through here
+        self._canvas.configure(yscrollcommand=self._on_yscroll)
+        self._inner = ttk.Frame(self._canvas)
+        self._window_id = self._canvas.create_window((0, 0), window=self._inner, anchor='nw')
+
+        # Resizing fires <Configure> per pixel; recompute the layout once it settles
+        self._canvas.bind('<Configure>', Debouncer(self, self._on_canvas_resize))
+
     def _add_force_row(self):
         """Add a new empty force row."""
+        start = len(self._values)
         success, msg = self.manager.add_force()
         self.app.log(('✓ ' if success else '! ') + msg)
-        self._rebuild_forces_list()
+        self._append_force_rows(start)
 
     def _clear_all_forces(self):
         """Clear all forces."""
         success, msg = self.manager.clear_forces()
         self.app.log(('✓ ' if success else '! ') + msg)
-        self._rebuild_forces_list()
+        self._destroy_force_rows()
+        self._show_forces_area(False)
 
     def _import_forces_file(self):
         """Import forces from file (one force per line)."""
@@ -58,81 +90,124 @@ class ForcesTab(ttk.Frame):
         if not file_path:
             return
 
+        # Parse in the background; the manager is only updated once the result is back
+        run_in_background(self, self._io_pool, self.manager.read_forces_file,
+                          lambda fut: self._on_forces_read(fut, file_path), file_path)
+
+    def _on_forces_read(self, future, file_path):
         try:
-            success, msg, imported = self.manager.import_forces_file(file_path)
+            error, values, rejected = future.result()
         except Exception as e:
             self.app.log(f'! Błąd przy czytaniu pliku sił: {e}')
             return
+        if error is not None:
+            self.app.log('! ' + error)
+            return
 
+        start = len(self._values)
+        success, msg, imported = self.manager.import_forces_array(values, rejected, os.path.basename(file_path))
         if success:
             self.app.log('✓ ' + msg)
-            self._rebuild_forces_list()
+            self._append_force_rows(start)
         else:
             self.app.log('! ' + msg)
 
-    def _rebuild_forces_list(self):
-        """Rebuild the forces list UI."""
-        # Clear container
-        for widget in self.container.winfo_children():
-            widget.destroy()
-
-        if not self.manager.get_forces():
-            lbl = ttk.Label(self.container, text='(brak zdefiniowanych sił)')
-            lbl.pack(padx=10, pady=10)
-            return
-
-        # Canvas and scrollbar for forces
-        canvas = tk.Canvas(self.container)
-        vsb = ttk.Scrollbar(self.container, orient='vertical', command=canvas.yview)
-        canvas.configure(yscrollcommand=vsb.set)
-        vsb.pack(side='right', fill='y')
-        canvas.pack(side='left', fill='both', expand=True)
+    def _append_force_rows(self, start):
+        """Add rows for manager forces from index `start` on; existing rows are left as they are."""
+        forces = self.manager.get_forces()
+        self._values.extend(str(f.get('value', '')) for f in forces[start:])
+        self._show_forces_area(bool(forces))
+        self._update_scrollregion()
+
+    def _destroy_force_rows(self):
+        self._values = []
+        for ent in self._pool:
+            ent.place_forget()
+        self._pool_rows = [-1] * len(self._pool)
+        self._update_scrollregion()
+
+    def _show_forces_area(self, has_forces):
+        """Show the scrollable list, or the placeholder label when there are no forces."""
+        if has_forces:
+            self.lbl_empty.pack_forget()
+            self._header.pack(side='top', fill='x')
+            self._vsb.pack(side='right', fill='y')
+            self._canvas.pack(side='left', fill='both', expand=True)
+        else:
+            self._header.pack_forget()
+            self._vsb.pack_forget()
+            self._canvas.pack_forget()
+            self.lbl_empty.pack(padx=10, pady=10)
+
+    # Virtualized rows
+    def _update_scrollregion(self):
+        """Size the inner frame to the full row count (so the scrollbar reflects every force) and re-render."""
+        height = len(self._values) * _ROW_HEIGHT
+        self._canvas.itemconfig(self._window_id, height=height)
+        self._canvas.configure(scrollregion=(0, 0, self._canvas.winfo_width(), height))
+        self._render_visible()
+
+    def _on_canvas_resize(self):
+        try:
+            self._canvas.itemconfig(self._window_id, width=self._canvas.winfo_width())
+        except Exception:
+            pass
+        self._update_scrollregion()
+
+    def _on_yscroll(self, first, last):
+        self._vsb.set(first, last)
+        self._render_visible()
+
+    def _ensure_pool(self):
+        """Grow the Entry pool to cover the current canvas height (plus a row above and below)."""
+        view_height = self._canvas.winfo_height()
+        if view_height <= 1:
+            view_height = 300
+        needed = -(-view_height // _ROW_HEIGHT) + 2
+        while len(self._pool) < needed:
+            var = tk.StringVar(self)
+            self._pool.append(ttk.Entry(self._inner, width=15, textvariable=var))
+            self._pool_vars.append(var)
+            self._pool_rows.append(-1)
+
+    def _render_visible(self):
+        """Point the pooled Entries at the rows inside the viewport; no widgets are created on scroll."""
+        self._ensure_pool()
+        values = self._values
+        count = len(values)
+        first = int(self._canvas.canvasy(0) // _ROW_HEIGHT)
+        first = max(0, min(first, count - len(self._pool)))
+        self._flush_pool()  # keep edits of the rows scrolling out
+        for slot, ent in enumerate(self._pool):
+            idx = first + slot
+            if self._pool_rows[slot] == idx and idx < count:
+                continue
+            if idx < count:
+                self._pool_vars[slot].set(values[idx])
+                ent.place(x=4, y=idx * _ROW_HEIGHT + 2)
+                self._pool_rows[slot] = idx
+            else:
+                ent.place_forget()
+                self._pool_rows[slot] = -1
 
-        inner = ttk.Frame(canvas)
-        window_id = canvas.create_window((0, 0), window=inner, anchor='nw')
-
-        # Header
-        frm_header = ttk.Frame(inner)
-        frm_header.grid(row=0, column=0, columnspan=2, sticky='we', padx=4, pady=4)
-        ttk.Label(frm_header, text='Siła [N]', font=('', 9, 'bold')).pack(side='left')
-
-        # Force rows
-        self.force_widgets = {}
-        for idx, force_data in enumerate(self.manager.get_forces(), start=1):
-            ent = ttk.Entry(inner, width=15)
-            ent.grid(row=idx, column=0, padx=4, pady=2, sticky='w')
-            ent.delete(0, 'end')
-            ent.insert(0, str(force_data.get('value', '')))
-            self.force_widgets[idx - 1] = ent
-
-        # Configure scrolling
-        def _on_config_inner(event):
-            canvas.configure(scrollregion=canvas.bbox('all'))
-
-        def _on_canvas_config(event):
-            try:
-                canvas.itemconfig(window_id, width=event.width)
-            except Exception:
-                pass
-
-        inner.bind('<Configure>', _on_config_inner)
-        canvas.bind('<Configure>', _on_canvas_config)
+    def _flush_pool(self):
+        """Copy the text of the visible Entries back into _values."""
+        values = self._values
+        for var, idx in zip(self._pool_vars, self._pool_rows):
+            if 0 <= idx < len(values):
+                values[idx] = var.get()
 
     def _save_forces(self):
-        """Save forces from widgets back to self.forces."""
-        values = []
-        for idx in sorted(self.force_widgets.keys()):
-            ent = self.force_widgets[idx]
-            try:
-                values.append(ent.get().strip())
-            except Exception:
-                values.append('')
-        self.manager.update_force_values(values)
-        self.app.system_forces = self.manager.get_forces().copy()
+        """Save forces from the row texts back to the manager; returns the snapshot stored in the app."""
+        self._flush_pool()
+        forces = self.manager.update_force_values([v.strip() for v in self._values])
+        # Copy: the manager appends to / clears its list in place
+        self.app.system_forces = forces.copy()
         self.app.log('✓ Zapisano siły do systemu')
+        return self.app.system_forces
 
     def _generate_report(self):
-        """Generate and display contact pressure report for each force and TCR interface."""
+        """Generate the contact pressure report for each force and TCR interface and show it."""
         # Save current forces first
         self._save_forces()
 
@@ -153,67 +228,58 @@ class ForcesTab(ttk.Frame):
         self._show_report_window(report_data)
 
     def _show_report_window(self, report_data):
-        """Display report in a new window with table and CSV export."""
+        """Display report in a new window with table and CSV export.
+
+        Reports above _REPORT_AUTO_ROWS rows open with an empty table that is filled on
+        'Show Table', so an export-only visit never formats or inserts the rows.
+        """
         report_win = tk.Toplevel(self.app)
         report_win.title('Raport: Nacisk i Ciśnienie Kontaktowe')
         report_win.geometry('900x600')
 
-        # Toolbar with Export button
+        # Toolbar with Export / Show Table buttons and a row count summary
         frm_toolbar = ttk.Frame(report_win)
         frm_toolbar.pack(fill='x', padx=10, pady=8)
 
         ttk.Button(frm_toolbar, text='Export to CSV', 
                   command=lambda: self._export_report_csv(report_data)).pack(side='left', padx=4)
+        btn_show = ttk.Button(frm_toolbar, text='Show Table')
+        btn_show.pack(side='left', padx=4)
+        ttk.Label(frm_toolbar, text=f'Obliczono {len(report_data)} wierszy').pack(side='left', padx=8)
 
         # Table with scrollbars
-        frm_table = ttk.Frame(report_win)
-        frm_table.pack(fill='both', expand=True, padx=10, pady=10)
-
-        # Canvas for scrolling
-        canvas = tk.Canvas(frm_table)
-        vsb = ttk.Scrollbar(frm_table, orient='vertical', command=canvas.yview)
-        hsb = ttk.Scrollbar(frm_table, orient='horizontal', command=canvas.xview)
-        canvas.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-
-        vsb.pack(side='right', fill='y')
-        hsb.pack(side='bottom', fill='x')
-        canvas.pack(side='left', fill='both', expand=True)
-
-        inner = ttk.Frame(canvas)
-        window_id = canvas.create_window((0, 0), window=inner, anchor='nw')
-
-        # Headers
-        headers = ['Siła [N]', 'Interfejs', 'Pow. Nom. [m²]', 'Ciśnienie [Pa]', 'Ciśnienie [MPa]']
-        for col, header_text in enumerate(headers):
-            lbl = ttk.Label(inner, text=header_text, font=('', 9, 'bold'), background='lightgray')
-            lbl.grid(row=0, column=col, padx=4, pady=2, sticky='we')
-
-        # Data rows
-        for row_idx, row_data in enumerate(report_data, start=1):
-            force_val = row_data['force_value']
-            iface_name = row_data['interface']
-            area = row_data['area']
-            pressure_pa = row_data['pressure']
-            pressure_mpa = pressure_pa / 1e6
-
-            ttk.Label(inner, text=f"{force_val:.2f}").grid(row=row_idx, column=0, padx=4, pady=2)
-            ttk.Label(inner, text=iface_name).grid(row=row_idx, column=1, padx=4, pady=2)
-            ttk.Label(inner, text=f"{area:.6e}").grid(row=row_idx, column=2, padx=4, pady=2)
-            ttk.Label(inner, text=f"{pressure_pa:.2e}").grid(row=row_idx, column=3, padx=4, pady=2)
-            ttk.Label(inner, text=f"{pressure_mpa:.4f}").grid(row=row_idx, column=4, padx=4, pady=2)
-
-        # Configure scrolling
-        def _on_config_inner(event):
-            canvas.configure(scrollregion=canvas.bbox('all'))
-
-        def _on_canvas_config(event):
-            try:
-                canvas.itemconfig(window_id, width=event.width)
-            except Exception:
-                pass
-
-        inner.bind('<Configure>', _on_config_inner)
-        canvas.bind('<Configure>', _on_canvas_config)
+        table = ScrollableTable(report_win, columns=('force', 'interface', 'area', 'pressure_pa', 'pressure_mpa'),
+                                headings=('Siła [N]', 'Interfejs', 'Pow. Nom. [m²]', 'Ciśnienie [Pa]', 'Ciśnienie [MPa]'),
+                                width=(90, 220, 130, 120, 120), anchor='center')
+        table.pack(fill='both', expand=True, padx=10, pady=10)
+
+        def fill_table():
+            btn_show.destroy()
+            # Large reports are inserted in chunks; the progress bar goes away once the table is full
+            progress = ttk.Progressbar(frm_toolbar, length=200, maximum=max(len(report_data), 1))
+            progress.pack(side='right', padx=4)
+
+            def on_progress(done, total):
+                progress['value'] = done
+                if done >= total:
+                    progress.destroy()
+
+            # Format column by column (one format spec per column), then zip into rows
+            forces, names, areas, pressures = report_columns(report_data)
+            table.insert_rows_chunked(
+                list(zip(
+                    format_column('.2f', forces),
+                    names,
+                    format_column('.6e', areas),
+                    format_column('.2e', pressures),
+                    format_column('.4f', [p / 1e6 for p in pressures]),
+                )),
+                on_progress=on_progress,
+            )
+
+        btn_show.configure(command=fill_table)
+        if len(report_data) <= _REPORT_AUTO_ROWS:
+            fill_table()
 
     def _export_report_csv(self, report_data):
         """Export report data to CSV file."""
@@ -224,15 +290,15 @@ class ForcesTab(ttk.Frame):
         if not file_path:
             return
 
-        success, msg = self.manager.export_report_csv(file_path, report_data)
+        # The file is written in the background (write_report_csv sends no manager events)
+        run_in_background(self, self._io_pool, self.manager.write_report_csv,
+                          lambda fut: self._on_report_written(fut, file_path), file_path, report_data)
+
+    def _on_report_written(self, future, file_path):
+        success, msg = future.result()
         if success:
             self.app.log(f'✓ Eksportowano raport do pliku: {os.path.basename(file_path)}')
             messagebox.showinfo('Sukces', msg)
         else:
             messagebox.showerror('Błąd', msg)
             self.app.log('! ' + msg)
-
-    # --- Manager events ---
-    def _on_manager_event(self, event_type, data):
-        # UI redraws are driven by explicit calls
-        pass
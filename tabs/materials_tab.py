@@ -12,7 +12,24 @@ Behavior:
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from controllers import MaterialsManager
+from widgets import Debouncer, run_in_background
+
+# Editable material fields, in table column order (the first two are editable for every geometry)
+_MATERIAL_FIELDS = ('material_name', 'k', 'young', 'poisson', 'sigma', 'm', 'hc')
+_GEOM_COLUMNS = ('geometry',) + _MATERIAL_FIELDS
+# Shown in cells a geometry without TCR cannot edit
+_DISABLED_CELL = '—'
+_GEOM_HEADINGS = ('Geometry', 'Material name', 'k [W/mK]', 'Young [GPa]', 'Poisson [-]', 'RMS sigma [µm]', 'm [-]', 'Hc [MPa]')
+_TIM_HEADINGS = ('Name', 'k [W/mK]', 'Type (Gas/Paste)', 'Pressure-dependent', 'Actions')
+_TIM_NCOLS = len(_TIM_HEADINGS)
+# TIM rows built per idle callback; longer lists are spread over several
+_TIM_ROWS_PER_TICK = 25
+# Last saved materials and TIMs, used to prefill the tab on the first load of a session
+# (kept in the user's home directory, never next to the sources)
+_SNAPSHOT_FILE = os.path.join(os.path.expanduser('~'), '.tcr_calculator', 'materials_snapshot.json')
 
 
 class MaterialsTab(ttk.Frame):
@@ -21,12 +38,27 @@ class MaterialsTab(ttk.Frame):
         self.app = app
 
         # Manager for business logic
+        # UI redraws are driven by explicit calls (load_system/save/import); no manager subscription needed
         self.manager = MaterialsManager(app=self.app)
-        self.manager.subscribe(self._on_manager_event)
 
         # View state
-        self.row_widgets = {}  # geom_idx -> dict of widgets for the row
+        self._geom_tree = None  # ttk.Treeview with one row per geometry
+        self._geom_rows = {}    # tree iid -> (geometry name, editable fields)
+        self.rows_by_name = {}  # geometry name -> tree iid of its row
+        self.rows_by_name_extras = {}  # geometry name -> iids of further rows (duplicate names only)
+        self._cell_editor = None  # floating ttk.Entry for the cell being edited
+        self._cell_var = None     # its StringVar
+        self._editing = None      # (iid, field) of that cell
         self.tim_widgets = {}  # tim_idx -> dict of TIM widgets
+        self._tim_inner = None  # frame holding the TIM rows (None until a table is built)
+        self._tim_first_row = 0  # grid row of the first TIM row
+        self._tim_next_row = 0
+        self._tims_dirty = False  # TIM widgets edited since the manager last got their values
+        self._tim_queue = deque()  # TIMs whose rows are still to be built
+        self._tim_pump = None      # pending after_idle id of _pump_tim_rows
+        # File parsing runs here, off the Tk thread
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._snapshot_checked = False
 
         # Header / controls
         frm_top = ttk.Frame(self)
@@ -52,6 +84,14 @@ class MaterialsTab(ttk.Frame):
     def _clear_container(self):
         for w in self.container.winfo_children():
             w.destroy()
+        self._geom_tree = None
+        self._geom_rows = {}
+        self.rows_by_name = {}
+        self.rows_by_name_extras = {}
+        self._cell_editor = None
+        self._editing = None
+        self._tim_inner = None
+        self._cancel_tim_rows()
 
     def _show_no_system(self):
         self._clear_container()
@@ -69,148 +109,133 @@ class MaterialsTab(ttk.Frame):
             return
         interfaces = getattr(self.app, 'system_interfaces', []) or []
         self.manager.set_system(geoms, interfaces)
+        if not self._snapshot_checked:
+            # Prefill from the last saved snapshot, unless data was entered in this session already
+            self._snapshot_checked = True
+            if os.path.exists(_SNAPSHOT_FILE) and not self.manager.get_tims() and not self.manager.get_materials():
+                success, msg = self.manager.load_snapshot(_SNAPSHOT_FILE)
+                self.app.log(('i ' if success else '! ') + msg)
         # Build table UI
         self._build_table(geoms)
 
     def _build_table(self, geoms):
-        # First, save current TIM values from widgets before clearing
+        # First, save current TIM values from widgets before clearing (only if the user edited them;
+        # otherwise the manager already holds what the widgets show)
         current_tims = []
-        for tim_idx, widgets in self.tim_widgets.items():
+        for widgets in (self.tim_widgets.values() if self._tims_dirty else ()):
+            ent_name = widgets['name'].get()
+            k_val = widgets['k'].get()
+            if ent_name.strip() == '' and k_val == '':
+                continue
             try:
-                ent_name = widgets['name'].get()
-                k_val = widgets['k'].get()
-                type_val = widgets['type'].get()
-                press_val = widgets['pressure_dependent'].get()
-                tid = widgets.get('id')
-                if ent_name.strip() == '' and k_val == '':
-                    continue
-                tim_obj = {
-                    'id': tid,
-                    'name': ent_name,
-                    'k': float(k_val) if k_val != '' else '',
-                    'type': type_val,
-                    'pressure_dependent': press_val
-                }
-                current_tims.append(tim_obj)
-            except Exception:
-                pass
+                k = float(k_val) if k_val != '' else ''
+            except ValueError:
+                continue  # an invalid k drops the row, as on save
+            current_tims.append({
+                'id': widgets.get('id'),
+                'name': ent_name,
+                'k': k,
+                'type': widgets['type'].get(),
+                'pressure_dependent': widgets['pressure_dependent'].get()
+            })
+        # TIMs still waiting for their rows are unchanged manager entries
+        current_tims.extend(self._tim_queue if self._tims_dirty else ())
         if current_tims:
             self.manager.set_tims(current_tims)
-        
-        self._clear_container()
+        self._tims_dirty = False
 
-        # Scrollable area
-        canvas = tk.Canvas(self.container)
-        vsb = ttk.Scrollbar(self.container, orient='vertical', command=canvas.yview)
-        canvas.configure(yscrollcommand=vsb.set)
-        vsb.pack(side='right', fill='y')
-        canvas.pack(side='left', fill='both', expand=True)
-
-        inner = ttk.Frame(canvas)
-        window_id = canvas.create_window((0, 0), window=inner, anchor='nw')
-
-        # Column headers
-        cols = ['Geometry', 'Material name', 'k [W/mK]', 'Young [GPa]', 'Poisson [-]', 'RMS sigma [µm]', 'm [-]', 'Hc [MPa]']
-        for i, c in enumerate(cols):
-            lbl = ttk.Label(inner, text=c, relief='sunken')
-            lbl.grid(row=0, column=i, padx=4, pady=4, sticky='ew')
+        self._clear_container()
 
-        # Get interfaces info from app
-        interfaces = getattr(self.app, 'system_interfaces', []) or []
+        # ===== GEOMETRY MATERIALS SECTION =====
+        # One Treeview row per geometry; a cell is edited in a floating Entry on double-click
+        frm_geoms = ttk.Frame(self.container)
+        frm_geoms.pack(fill='both', expand=True)
+        tree = ttk.Treeview(frm_geoms, columns=_GEOM_COLUMNS, show='headings', height=min(max(len(geoms), 1), 12))
+        geom_vsb = ttk.Scrollbar(frm_geoms, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=geom_vsb.set)
+        for col, heading in zip(_GEOM_COLUMNS, _GEOM_HEADINGS):
+            tree.heading(col, text=heading)
+            tree.column(col, width=110, anchor='w')
+        geom_vsb.pack(side='right', fill='y')
+        tree.pack(side='left', fill='both', expand=True)
+        tree.bind('<Double-1>', self._begin_cell_edit)
+        self._geom_tree = tree
+
+        self._cell_var = tk.StringVar(tree)
+        self._cell_editor = ttk.Entry(tree, textvariable=self._cell_var)
+        self._cell_editor.bind('<Return>', lambda e: self._finish_cell_edit())
+        self._cell_editor.bind('<FocusOut>', lambda e: self._finish_cell_edit())
+        self._cell_editor.bind('<Escape>', lambda e: self._finish_cell_edit(commit=False))
+
+        # Geometries in a TCR interface (set once per load_system by the manager)
+        tcr_names = self.manager.tcr_geometry_names()
 
         # Populate rows
-        self.row_widgets = {}  # row_idx -> {'name': name, ...widgets}
-        self.rows_by_name = {}  # name -> list of row_idx
         self.tim_widgets = {}  # Reset TIM widgets for rebuild
-        for r, g in enumerate(geoms, start=1):  # Start from row 1 (row 0 is header)
+        # Loop-invariant lookups bound once
+        ensure_entry = self.manager.ensure_material_entry
+        insert = tree.insert
+        geom_rows = self._geom_rows
+        rows_by_name = self.rows_by_name
+        rows_by_name_extras = self.rows_by_name_extras
+        for geom_idx, g in enumerate(geoms):
             name = g.name
 
-            # Determine if this geometry (by index position) has TCR on either side
-            has_tcr_on_side = False
-            for it in interfaces:
-                try:
-                    if not getattr(it, 'has_tcr', False):
-                        continue
-                    # Check if this geometry is geom_top or geom_bottom in a TCR interface
-                    if (it.geom_top.name == name) or (it.geom_bottom.name == name):
-                        has_tcr_on_side = True
-                        break
-                except Exception:
-                    pass
+            # Does this geometry have TCR on either side
+            has_tcr_on_side = name in tcr_names
 
             # Initialize materials dict for this geometry name (preserve existing values)
-            self.manager.ensure_material_entry(g.name)
-
-            lbl = ttk.Label(inner, text=name)
-            lbl.grid(row=r, column=0, padx=4, pady=2, sticky='w')
-
-            materials = self.manager.get_materials()
-            def make_entry(val_key, col, state='normal'):
-                ent = ttk.Entry(inner)
-                ent.grid(row=r, column=col, padx=4, pady=2, sticky='we')
-                ent.delete(0, 'end')
-                ent.insert(0, str(materials.get(name, {}).get(val_key, '')))
-                if state == 'disabled':
-                    ent.state(['disabled'])
-                else:
-                    ent.state(['!disabled'])
-                return ent
-
-            e_material = make_entry('material_name', 1, state='normal')
-            e_k = make_entry('k', 2, state='normal')
-            e_young = make_entry('young', 3, state='normal' if has_tcr_on_side else 'disabled')
-            e_poisson = make_entry('poisson', 4, state='normal' if has_tcr_on_side else 'disabled')
-            e_sigma = make_entry('sigma', 5, state='normal' if has_tcr_on_side else 'disabled')
-            e_m = make_entry('m', 6, state='normal' if has_tcr_on_side else 'disabled')
-            e_hc = make_entry('hc', 7, state='normal' if has_tcr_on_side else 'disabled')
-
-            # Store row index by r-1 to map back to geometry index
-            geom_idx = r - 1
-            self.row_widgets[geom_idx] = {
-                'name': name,
-                'material_name': e_material,
-                'k': e_k,
-                'young': e_young,
-                'poisson': e_poisson,
-                'sigma': e_sigma,
-                'm': e_m,
-                'hc': e_hc,
-            }
-
-            self.rows_by_name.setdefault(name, []).append(geom_idx)
+            vals = ensure_entry(name)
+
+            # Without TCR only material name and k are editable
+            fields = _MATERIAL_FIELDS if has_tcr_on_side else _MATERIAL_FIELDS[:2]
+            iid = str(geom_idx)
+            insert('', 'end', iid=iid, values=(name,) + tuple(
+                str(vals.get(fld, '')) if fld in fields else _DISABLED_CELL for fld in _MATERIAL_FIELDS))
+            geom_rows[iid] = (name, fields)
+            if name in rows_by_name:
+                rows_by_name_extras.setdefault(name, []).append(iid)
+            else:
+                rows_by_name[name] = iid
+
+        # ===== TIM (Thermal Interface Material) SECTION =====
+        # Scrollable area
+        frm_tims = ttk.Frame(self.container)
+        frm_tims.pack(fill='both', expand=True)
+        canvas = tk.Canvas(frm_tims)
+        vsb = ttk.Scrollbar(frm_tims, orient='vertical', command=canvas.yview)
+        canvas.configure(yscrollcommand=vsb.set)
+        vsb.pack(side='right', fill='y')
+        canvas.pack(side='left', fill='both', expand=True)
+
+        inner = ttk.Frame(canvas)
+        window_id = canvas.create_window((0, 0), window=inner, anchor='nw')
 
         # Make columns expand responsively
-        for col_idx in range(len(cols)):
-            try:
-                inner.grid_columnconfigure(col_idx, weight=1)
-            except Exception:
-                pass
+        inner.grid_columnconfigure(tuple(range(_TIM_NCOLS)), weight=1)
 
         # Configure scrolling region
-        def _on_config_inner(event):
-            canvas.configure(scrollregion=canvas.bbox('all'))
+        def _on_config_inner():
+            if canvas.winfo_exists():  # the table may have been rebuilt meanwhile
+                canvas.configure(scrollregion=canvas.bbox('all'))
 
-        def _on_canvas_config(event):
+        def _on_canvas_config():
             # Make inner window width match canvas width for responsive columns
-            try:
-                canvas.itemconfig(window_id, width=event.width)
-            except Exception:
-                pass
+            # (the Debouncer only calls this while the canvas exists)
+            width = canvas.winfo_width()
+            if width > 1:
+                canvas.itemconfig(window_id, width=width)
 
-        inner.bind('<Configure>', _on_config_inner)
-        canvas.bind('<Configure>', _on_canvas_config)
-
-        # ===== TIM (Thermal Interface Material) SECTION =====
-        r = len(geoms) + 1  # Start row after materials section
+        r = 0
         
         # Add separator
         sep = ttk.Separator(inner, orient='horizontal')
-        sep.grid(row=r, column=0, columnspan=len(cols), sticky='we', pady=10)
+        sep.grid(row=r, column=0, columnspan=_TIM_NCOLS, sticky='we', pady=10)
         r += 1
         
         # Add TIM title with Add button
         frm_tim_header = ttk.Frame(inner)
-        frm_tim_header.grid(row=r, column=0, columnspan=len(cols), sticky='we', padx=4, pady=4)
+        frm_tim_header.grid(row=r, column=0, columnspan=_TIM_NCOLS, sticky='we', padx=4, pady=4)
         
         lbl_tim_title = ttk.Label(frm_tim_header, text='Materiały pośredniczące (TIM)', font=('', 10, 'bold'))
         lbl_tim_title.pack(side='left')
@@ -227,86 +252,21 @@ class MaterialsTab(ttk.Frame):
         r += 1
         
         # TIM table headers
-        tim_headers = ['Name', 'k [W/mK]', 'Type (Gas/Paste)', 'Pressure-dependent', 'Actions']
-        for col, header_text in enumerate(tim_headers):
+        for col, header_text in enumerate(_TIM_HEADINGS):
             lbl = ttk.Label(inner, text=header_text, font=('', 9, 'bold'), background='lightgray')
             lbl.grid(row=r, column=col, padx=4, pady=2, sticky='we')
         r += 1
         
         # Build TIM definition rows
-        for tim_idx, tim_data in enumerate(self.manager.get_tims()):
-            # Ensure each TIM has a stable unique id
-            if 'id' not in tim_data:
-                # Ask manager to maintain id sequence on set_tims/save
-                tid = tim_data.get('id') or None
-                if tid is None:
-                    # generate a temporary id for UI; real id will be set on save
-                    tid = - (tim_idx + 1)
-                tim_data['id'] = tid
-            # Column 0: TIM Name
-            ent_tim_name = ttk.Entry(inner)
-            ent_tim_name.grid(row=r, column=0, padx=4, pady=2, sticky='we')
-            ent_tim_name.delete(0, 'end')
-            ent_tim_name.insert(0, tim_data.get('name', ''))
-            
-            # Column 1: k [W/mK]
-            ent_tim_k = ttk.Entry(inner)
-            ent_tim_k.grid(row=r, column=1, padx=4, pady=2, sticky='we')
-            ent_tim_k.delete(0, 'end')
-            ent_tim_k.insert(0, str(tim_data.get('k', '')))
-            
-            # Column 2: Type (Radio buttons: Gas/Paste)
-            frm_type = ttk.Frame(inner)
-            frm_type.grid(row=r, column=2, padx=4, pady=2, sticky='we')
-            var_type = tk.StringVar(value=tim_data.get('type', 'gas'))
-            
-            # Column 3: Pressure-dependent (Radio buttons: Yes/No)
-            frm_pressure = ttk.Frame(inner)
-            frm_pressure.grid(row=r, column=3, padx=4, pady=2, sticky='we')
-            var_pressure = tk.BooleanVar(value=tim_data.get('pressure_dependent', False))
-            
-            rb_yes = ttk.Radiobutton(frm_pressure, text='Yes', variable=var_pressure, value=True)
-            rb_yes.pack(side='left', padx=2)
-            rb_no = ttk.Radiobutton(frm_pressure, text='No', variable=var_pressure, value=False)
-            rb_no.pack(side='left', padx=2)
-
-            # --- Logic to handle interaction between Type and Pressure Dependency ---
-            def update_pressure_state(_=None, v_type=var_type, v_press=var_pressure, r_y=rb_yes, r_n=rb_no):
-                if v_type.get() == 'paste':
-                    # Paste cannot be pressure dependent -> force No and disable
-                    v_press.set(False)
-                    r_y.configure(state='disabled')
-                    r_n.configure(state='disabled')
-                else:
-                    # Gas -> enable choice
-                    r_y.configure(state='normal')
-                    r_n.configure(state='normal')
-
-            # Bind the update to radio buttons
-            rb_gas = ttk.Radiobutton(frm_type, text='Gas', variable=var_type, value='gas', 
-                                     command=update_pressure_state)
-            rb_gas.pack(side='left', padx=2)
-            rb_paste = ttk.Radiobutton(frm_type, text='Paste', variable=var_type, value='paste',
-                                       command=update_pressure_state)
-            rb_paste.pack(side='left', padx=2)
-
-            # Initialize state
-            update_pressure_state()
-
-            # Column 4: Actions (no per-row remove when using global clear)
-            frm_actions = ttk.Frame(inner)
-            frm_actions.grid(row=r, column=4, padx=4, pady=2, sticky='we')
-            
-            # Store widget references (include id for persistence)
-            self.tim_widgets[tim_idx] = {
-                'id': tim_data.get('id'),
-                'name': ent_tim_name,
-                'k': ent_tim_k,
-                'type': var_type,
-                'pressure_dependent': var_pressure
-            }
-            
-            r += 1
+        self._tim_inner = inner
+        self._tim_first_row = self._tim_next_row = r
+        self._queue_tim_rows(self.manager.get_tims())
+
+        # Bind only once the table is populated, then lay it out in a single idle pass;
+        # resizing fires <Configure> per pixel, so recompute the layout once it settles
+        inner.bind('<Configure>', Debouncer(canvas, _on_config_inner))
+        canvas.bind('<Configure>', Debouncer(canvas, _on_canvas_config))
+        canvas.after_idle(_on_config_inner)
 
     def import_from_file(self):
         """Import material values from text file (ignore lines starting with '#').
@@ -328,121 +288,265 @@ class MaterialsTab(ttk.Frame):
             return
         # Ensure manager knows current system
         self.manager.set_system(geoms, interfaces)
-        success, msg, imported = self.manager.import_materials_from_file(file_path)
-        if not success:
-            messagebox.showerror('Error', msg)
+        # Parse in the background; the manager and the table are only updated once the result is back
+        run_in_background(self, self._io_pool, self.manager.read_materials_file,
+                          lambda fut: self._on_materials_read(fut, file_path), file_path)
+
+    def _on_materials_read(self, future, file_path):
+        try:
+            error, updates = future.result()
+        except Exception as e:
+            error = f'Failed to open file: {e}'
+        if error is not None:
+            messagebox.showerror('Error', error)
             return
-
-        # If table exists, refresh displayed values for all rows matching imported names
-        if self.row_widgets:
-            for name, row_indices in getattr(self, 'rows_by_name', {}).items():
-                vals = self.manager.get_materials().get(name, {})
-                for r in row_indices:
-                    widgets = self.row_widgets.get(r, {})
-                    for key, ent in widgets.items():
-                        if key == 'name':
-                            continue
-                        # update only if entry is enabled
-                        try:
-                            if 'disabled' in ent.state():
-                                continue
-                        except Exception:
-                            pass
-                        val = vals.get(key, '')
-                        ent.delete(0, 'end')
-                        ent.insert(0, str(val))
+        imported_names = {name for name, _ in updates}
+        if self._editing is not None:
+            # Keep an open cell edit, unless the import overwrites that geometry
+            edited_name = self._geom_rows[self._editing[0]][0]
+            self._finish_cell_edit(commit=edited_name not in imported_names)
+        _, _, imported = self.manager.apply_material_updates(updates, os.path.basename(file_path))
+
+        # If table exists, refresh the rows of the imported geometries only; the Treeview
+        # draws just the visible ones
+        if self._geom_rows:
+            tree_set = self._geom_tree.set
+            get_material = self.manager.get_material
+            rows_by_name = self.rows_by_name
+            rows_by_name_extras = self.rows_by_name_extras
+            geom_rows = self._geom_rows
+            for name in imported_names:
+                first = rows_by_name.get(name)
+                if first is None:
+                    continue
+                vals = get_material(name)
+                for iid in (first, *rows_by_name_extras.get(name, ())):
+                    # update only the editable cells
+                    for key in geom_rows[iid][1]:
+                        tree_set(iid, key, str(vals.get(key, '')))
 
         self.app.log(f'✓ Import materiałów zakończony. Zaimportowano poprawnie: {imported} rekordów. (Plik: {os.path.basename(file_path)})')
 
     def save_materials(self):
         """Collect values from table and save into app.system_materials and app.system_tims."""
-        # Read from widgets into local materials
-        materials = self.manager.get_materials().copy()
-        for r, widgets in self.row_widgets.items():
-            name = widgets.get('name')
-            if not name:
-                continue
-            if name not in materials:
-                materials[name] = {}
-            for key, ent in widgets.items():
-                if key == 'name':
-                    continue
-                try:
-                    val = ent.get()
-                except Exception:
-                    val = ent.get()
-                if key == 'material_name':
-                    materials[name][key] = val
-                else:
-                    if val == '':
-                        materials[name][key] = ''
-                    else:
-                        try:
-                            materials[name][key] = float(val)
-                        except ValueError:
-                            materials[name][key] = val
-                            self.app.log(f'! Zapis materiałów: pole {key} dla bryły {name} ma nieprawidłową wartość: "{val}"')
+        # Cell edits are stored in the manager as they are committed; flush an open one
+        self._finish_cell_edit()
+        self._finish_tim_rows()  # every TIM must have its row before the rows are read
 
         # Read from TIM widgets into tims list
         tims = []
-        for tim_idx in sorted(self.tim_widgets.keys()):
+        log = self.app.log
+        for tim_idx in sorted(self.tim_widgets):
             widgets = self.tim_widgets[tim_idx]
-            tim_data = {}
-            wid_id = widgets.get('id')
-            tim_data['id'] = wid_id if wid_id else None
-            try:
-                tim_name = widgets['name'].get().strip()
-                if not tim_name:
-                    continue
-                tim_data['name'] = tim_name
-            except Exception:
+            tim_name = widgets['name'].get().strip()
+            if not tim_name:
                 continue
+            tim_k = widgets['k'].get()
             try:
-                tim_k = widgets['k'].get()
-                tim_data['k'] = float(tim_k) if tim_k != '' else ''
+                k = float(tim_k) if tim_k != '' else ''
             except ValueError:
-                self.app.log(f'! Zapis TIM: pole k ma nieprawidłową wartość: "{tim_k}"')
+                log(f'! Zapis TIM: pole k ma nieprawidłową wartość: "{tim_k}"')
                 continue
-            try:
-                tim_type = widgets['type'].get()
-                tim_data['type'] = tim_type
-            except Exception:
-                tim_data['type'] = 'gas'
-            try:
-                tim_pressure = widgets['pressure_dependent'].get()
-                if tim_data['type'] == 'paste':
-                    tim_pressure = False
-                tim_data['pressure_dependent'] = tim_pressure
-            except Exception:
-                tim_data['pressure_dependent'] = False
-            tims.append(tim_data)
+            tim_type = widgets['type'].get()
+            tims.append({
+                'id': widgets.get('id') or None,
+                'name': tim_name,
+                'k': k,
+                'type': tim_type,
+                # Paste is never pressure dependent
+                'pressure_dependent': tim_type != 'paste' and widgets['pressure_dependent'].get(),
+            })
 
         # Update manager and validate
-        self.manager.set_materials(materials)
         self.manager.set_tims(tims)
+        self._tims_dirty = False
         ok, msg, errors = self.manager.validate_before_save()
         if not ok:
             messagebox.showerror('Błąd zapisu', msg)
             for e in errors:
                 self.app.log('! ' + e)
             return
-        # Save to app
-        self.app.system_materials = self.manager.get_materials().copy()
-        self.app.system_tims = self.manager.get_tims().copy()
+        # Save to app; the materials view is never changed in place, so it needs no copy
+        self.app.system_materials = self.manager.get_materials()
+        self.app.system_tims = [dict(t) for t in self.manager.get_tims()]
+        success, snapshot_msg = self.manager.save_snapshot(_SNAPSHOT_FILE)
+        if not success:
+            self.app.log('! ' + snapshot_msg)
         self.app.log('✓ Zapisano materiały i TIM-y do systemu')
 
+    def _build_tim_row(self, tim_idx, tim_data):
+        """Grid one TIM row at the next free row of the TIM section and register its widgets."""
+        inner = self._tim_inner
+        r = self._tim_next_row
+        # Ensure each TIM has a stable unique id
+        if 'id' not in tim_data:
+            # Ask manager to maintain id sequence on set_tims/save
+            tid = tim_data.get('id') or None
+            if tid is None:
+                # generate a temporary id for UI; real id will be set on save
+                tid = - (tim_idx + 1)
+            tim_data['id'] = tid
+        # Column 0: TIM Name
+        var_name = tk.StringVar(inner, value=tim_data.get('name', ''))
+        ent_tim_name = ttk.Entry(inner, textvariable=var_name)
+        ent_tim_name.grid(row=r, column=0, padx=4, pady=2, sticky='we')
+        
+        # Column 1: k [W/mK]
+        var_k = tk.StringVar(inner, value=str(tim_data.get('k', '')))
+        ent_tim_k = ttk.Entry(inner, textvariable=var_k)
+        ent_tim_k.grid(row=r, column=1, padx=4, pady=2, sticky='we')
+        
+        # Column 2: Type (Radio buttons: Gas/Paste)
+        frm_type = ttk.Frame(inner)
+        frm_type.grid(row=r, column=2, padx=4, pady=2, sticky='we')
+        var_type = tk.StringVar(value=tim_data.get('type', 'gas'))
+        
+        # Column 3: Pressure-dependent (Radio buttons: Yes/No)
+        frm_pressure = ttk.Frame(inner)
+        frm_pressure.grid(row=r, column=3, padx=4, pady=2, sticky='we')
+        var_pressure = tk.BooleanVar(value=tim_data.get('pressure_dependent', False))
+        
+        rb_yes = ttk.Radiobutton(frm_pressure, text='Yes', variable=var_pressure, value=True)
+        rb_yes.pack(side='left', padx=2)
+        rb_no = ttk.Radiobutton(frm_pressure, text='No', variable=var_pressure, value=False)
+        rb_no.pack(side='left', padx=2)
+
+        # Column 4: Actions (no per-row remove when using global clear)
+        frm_actions = ttk.Frame(inner)
+        frm_actions.grid(row=r, column=4, padx=4, pady=2, sticky='we')
+        
+        # Store widget/variable references (include id for persistence)
+        self.tim_widgets[tim_idx] = {
+            'id': tim_data.get('id'),
+            'name': var_name,
+            'k': var_k,
+            'type': var_type,
+            'pressure_dependent': var_pressure,
+            'pressure_buttons': (rb_yes, rb_no),
+            'row': (ent_tim_name, ent_tim_k, frm_type, frm_pressure, frm_actions),
+        }
+
+        # Type radio buttons keep the pressure-dependency choice consistent
+        for text, value in (('Gas', 'gas'), ('Paste', 'paste')):
+            ttk.Radiobutton(frm_type, text=text, variable=var_type, value=value,
+                            command=lambda i=tim_idx: self._sync_pressure(i)).pack(side='left', padx=2)
+
+        # Initialize state, then start tracking user edits
+        self._sync_pressure(tim_idx)
+        for var in (var_name, var_k, var_type, var_pressure):
+            var.trace_add('write', self._mark_tims_dirty)
+        self._tim_next_row = r + 1
+
+    def _mark_tims_dirty(self, *_):
+        self._tims_dirty = True
+
+    def _sync_pressure(self, tim_idx):
+        """Paste cannot be pressure dependent: force 'No' and disable the choice; gas enables it."""
+        widgets = self.tim_widgets[tim_idx]
+        if widgets['type'].get() == 'paste':
+            widgets['pressure_dependent'].set(False)
+            state = 'disabled'
+        else:
+            state = 'normal'
+        for rb in widgets['pressure_buttons']:
+            rb.configure(state=state)
+
+    def _next_tim_idx(self):
+        return max(self.tim_widgets, default=-1) + 1
+
+    # --- Deferred TIM row building ---
+    def _queue_tim_rows(self, tims):
+        """Build rows for `tims` a few per idle callback, so a long list does not freeze the window."""
+        self._tim_queue.extend(tims)
+        if self._tim_pump is None and self._tim_queue:
+            self._tim_pump = self.after_idle(self._pump_tim_rows)
+
+    def _pump_tim_rows(self, limit=_TIM_ROWS_PER_TICK):
+        self._tim_pump = None
+        queue = self._tim_queue
+        build_row = self._build_tim_row
+        start = self._next_tim_idx()
+        for tim_idx in range(start, start + min(limit, len(queue))):
+            build_row(tim_idx, queue.popleft())
+        if queue:
+            self._tim_pump = self.after_idle(self._pump_tim_rows)
+
+    def _finish_tim_rows(self):
+        """Build all still queued TIM rows now."""
+        if self._tim_pump is not None:
+            self.after_cancel(self._tim_pump)
+            self._pump_tim_rows(limit=len(self._tim_queue))
+
+    def _cancel_tim_rows(self):
+        if self._tim_pump is not None:
+            self.after_cancel(self._tim_pump)
+            self._tim_pump = None
+        self._tim_queue.clear()
+
+    # --- Geometry table cell editing ---
+    def _begin_cell_edit(self, event):
+        """Open the floating editor over the double-clicked cell, if that cell is editable."""
+        tree = self._geom_tree
+        iid = tree.identify_row(event.y)
+        col = tree.identify_column(event.x)
+        if not iid or not col:
+            return
+        fld = _GEOM_COLUMNS[int(col[1:]) - 1]
+        if fld not in self._geom_rows[iid][1]:
+            return  # geometry name, or a TCR-only field of a geometry without TCR
+        bbox = tree.bbox(iid, fld)
+        if not bbox:
+            return
+        self._finish_cell_edit()
+        x, y, width, height = bbox
+        ent = self._cell_editor
+        self._cell_var.set(tree.set(iid, fld))
+        ent.select_range(0, 'end')
+        ent.place(x=x, y=y, width=width, height=height)
+        ent.focus_set()
+        self._editing = (iid, fld)
+
+    def _finish_cell_edit(self, commit=True):
+        """Close the floating editor, writing its text to the cell unless commit is False."""
+        if self._editing is None:
+            return
+        iid, fld = self._editing
+        self._editing = None
+        if commit:
+            value = self._cell_var.get()
+            self._geom_tree.set(iid, fld, value)
+            # The manager is the model: store the edit right away (numeric fields as floats)
+            name = self._geom_rows[iid][0]
+            if not self.manager.set_field(name, fld, value):
+                self.app.log(f'! Pole {fld} dla bryły {name} ma nieprawidłową wartość: "{value}"')
+        self._cell_editor.place_forget()
+
     def _add_tim_row(self):
         """Add a new empty TIM row to the library."""
         success, msg = self.manager.add_tim()
         if success:
             self.app.log('✓ ' + msg)
-        self.load_system()  # Rebuild table to show new row
+        if self._tim_inner is None:
+            self.load_system()  # No table yet: build it
+            return
+        # Append just the new row (after any rows still being built)
+        self._queue_tim_rows(self.manager.get_tims()[-1:])
 
     def _clear_all_tims(self):
         """Clear the entire TIM library."""
         success, msg = self.manager.clear_all_tims()
         self.app.log(('✓ ' if success else '! ') + msg)
-        self.load_system()
+        if self._tim_inner is None:
+            self.load_system()
+            return
+        # Remove the TIM rows only; the rest of the table stays
+        self._cancel_tim_rows()
+        for widgets in self.tim_widgets.values():
+            for w in widgets['row']:
+                w.destroy()
+        self.tim_widgets = {}
+        self._tims_dirty = False
+        self._tim_next_row = self._tim_first_row
 
     def _import_tim_file(self):
         """Import TIM definitions from file (ignore lines starting with '#').
@@ -456,13 +560,24 @@ class MaterialsTab(ttk.Frame):
         file_path = filedialog.askopenfilename(filetypes=[('Text files', '*.txt'), ('All', '*.*')])
         if not file_path:
             return
-        success, msg = self.manager.import_tim_file(file_path)
+        run_in_background(self, self._io_pool, self.manager.read_tim_file,
+                          lambda fut: self._on_tims_read(fut, file_path), file_path)
+
+    def _on_tims_read(self, future, file_path):
+        try:
+            error, parsed = future.result()
+        except Exception as e:
+            error = f'Błąd przy czytaniu pliku TIM: {e}'
+        if error is not None:
+            self.app.log('! ' + error)
+            return
+        start = len(self.manager.get_tims())
+        success, msg = self.manager.import_tim_entries(parsed, os.path.basename(file_path))
         self.app.log(('✓ ' if success else '! ') + msg)
-        if success:
+        if not success:
+            return
+        if self._tim_inner is None:
             self.load_system()
-
-    # --- Manager events ---
-    def _on_manager_event(self, event_type, data):
-        if event_type in ('materials_updated', 'tims_updated', 'tim_added', 'tims_cleared', 'tims_imported', 'materials_imported', 'materials_system_set'):
-            # For simplicity, leave redraw to caller actions (load_system/save/import) to avoid flicker
-            pass
\ No newline at end of file
+            return
+        # Append rows for the imported TIMs only
+        self._queue_tim_rows(self.manager.get_tims()[start:])
@@ -5,9 +5,8 @@ Refactored for maintainability and modularity.
 """
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import csv
-import os
 from controllers import SimulationManager
+from widgets import Debouncer, ScrollableTable
 
 class SimulationTab(ttk.Frame):
     def __init__(self, parent, app):
@@ -15,8 +14,8 @@ class SimulationTab(ttk.Frame):
         self.app = app
 
         # Manager for business logic
+        # UI is updated directly by the tab's actions; no manager subscription needed
         self.manager = SimulationManager(app=self.app)
-        self.manager.subscribe(self._on_manager_event)
 
         # UI state
         self.interface_config = {}
@@ -48,8 +47,11 @@ class SimulationTab(ttk.Frame):
         
         self.window_id = self.canvas.create_window((0, 0), window=self.scroll_inner, anchor='nw')
         
-        self.scroll_inner.bind('<Configure>', lambda e: self.canvas.configure(scrollregion=self.canvas.bbox('all')))
-        self.canvas.bind('<Configure>', lambda e: self.canvas.itemconfig(self.window_id, width=e.width))
+        # Resizing fires <Configure> per pixel; recompute the layout once it settles
+        self.scroll_inner.bind('<Configure>', Debouncer(
+            self, lambda: self.canvas.configure(scrollregion=self.canvas.bbox('all'))))
+        self.canvas.bind('<Configure>', Debouncer(
+            self, lambda: self.canvas.itemconfig(self.window_id, width=self.canvas.winfo_width())))
 
         # 2. Boundary Conditions
         frm_bc = ttk.LabelFrame(self, text='2. Warunki brzegowe', padding=10)
@@ -242,7 +244,7 @@ class SimulationTab(ttk.Frame):
 
         path_tcr, path_q = self.manager.export_results(model_name, results_tcr, results_q)
         self.app.log(f"Sim {model_name} completed. Files saved.")
-        self._show_results_window(f"{model_name} - Szczegóły (TCR)", results_tcr, 
+        self._show_results_window(f"{model_name} - Szczegóły (TCR)", results_tcr.rows(), 
                                   ['force_N', 'interface', 'pressure_Pa', 'pct_styku', 'pct_int', 'h_c', 'R_c', 'h_int', 'R_int', 'h_eff', 'TCR', 'K'])
         self._show_results_window(f"{model_name} - Podsumowanie (Q)", results_q, 
                                   ['force_N', 'R_U', 'TCRsum', 'Q'])
@@ -258,97 +260,15 @@ class SimulationTab(ttk.Frame):
             except: pass
         return vals
 
-    def _calculate_system_q(self, forces, tcr_data, thot, tcold, materials):
-        """Calculates total system resistance and heat flow for each force case."""
-        # 1. Bulk Resistance (R_bulk)
-        # Deprecated (handled in manager)
-        return self.manager._calculate_system_q(forces, tcr_data, thot, tcold)
-
-    def _export_and_show_results(self, model_name, tcr_rows, q_rows):
-        """Handles CSV export and window display with specific requested format."""
-        # Filenames
-        tag = model_name.lower().replace(' ', '_').replace('-', '_')
-
-        output_dir = os.path.join(os.getcwd(), 'results', tag)
-        os.makedirs(output_dir, exist_ok=True)
-
-        path_tcr = os.path.join(output_dir, f"TCR.csv")
-        path_q = os.path.join(output_dir, f"Q.csv")
-
-        # --- Save TCR CSV ---
-        # Requested Format: ciśnienie [Pa], %styku, %int, hc [W/m^2K], Rc [K/W], h_int[W/m^2K], R_int [K/W], h_eff [W/m^2K, TCR [K/W], K_warstwy
-        # (Keeping Force/Interface at the start for data integrity)
-        try:
-            with open(path_tcr, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                headers = [
-                    'Force[N]', 'Interface', 
-                    'ciśnienie [Pa]', '%styku', '%int', 
-                    'hc [W/m^2K]', 'Rc [K/W]', 
-                    'h_int[W/m^2K]', 'R_int [K/W]', 
-                    'h_eff [W/m^2K]', 'TCR [K/W]', 'K_warstwy'
-                ]
-                writer.writerow(headers)
-                
-                for r in tcr_rows:
-                    writer.writerow([
-                        r['force_N'], 
-                        r['interface'], 
-                        f"{r['pressure_Pa']:.4f}",
-                        f"{r['pct_styku']:.2f}",
-                        f"{r['pct_int']:.2f}",
-                        f"{r['h_c']:.4f}",
-                        (f"{r['R_c']:.4f}" if r['R_c'] != float('inf') else 'INF'),
-                        f"{r['h_int']:.4f}",
-                        (f"{r['R_int']:.4f}" if r['R_int'] != float('inf') else 'INF'),
-                        f"{r['h_eff']:.4f}",
-                        (f"{r['TCR']:.4f}" if r['TCR'] != float('inf') else 'INF'),
-                        f"{r['K']:.4f}"
-                    ])
-        except Exception as e:
-            self.app.log(f"Error saving TCR: {e}")
-
-        # --- Save Q CSV ---
-        # Requested Format: R_U (całkowity opor przenikania)[K/W], TCRsum (całkowity opór tcr w systemie,suma wszystkich TCR) [K/W], Q [W]
-        try:
-            with open(path_q, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                headers = ['Force[N]', 'R_U [K/W]', 'TCRsum [K/W]', 'Q [W]']
-                writer.writerow(headers)
-                
-                for r in q_rows:
-                    writer.writerow([
-                        r['force_N'], 
-                        f"{r['R_U']:.4f}", 
-                        f"{r['TCRsum']:.4f}",
-                        f"{r['Q']:.4f}"
-                    ])
-        except Exception as e:
-            self.app.log(f"Error saving Q: {e}")
-
-        self.app.log(f"Sim {model_name} completed. Files saved.")
-        
-        # Show Result Windows (mapped keys to display)
-        # handled in run_generic
-
     def _show_results_window(self, title, data, keys):
         win = tk.Toplevel(self)
         win.title(title)
         win.geometry("1100x400") # Wider for more columns
         
-        tree = ttk.Treeview(win, columns=keys, show='headings')
-        for k in keys:
-            tree.heading(k, text=k)
-            tree.column(k, width=80)
-        
-        vsb = ttk.Scrollbar(win, orient="vertical", command=tree.yview)
-        hsb = ttk.Scrollbar(win, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        
-        tree.pack(side='left', fill='both', expand=True)
-        vsb.pack(side='right', fill='y')
-        hsb.pack(side='bottom', fill='x')
+        table = ScrollableTable(win, columns=keys)
+        table.pack(fill='both', expand=True)
 
+        rows = []
         for item in data:
             vals = []
             for k in keys:
@@ -358,7 +278,8 @@ class SimulationTab(ttk.Frame):
                     else: vals.append(f"{v:.4g}")
                 else:
                     vals.append(str(v))
-            tree.insert('', 'end', values=vals)
+            rows.append(vals)
+        table.insert_rows(rows)
 
     def _show_microsurface_report(self):
         """Displays calculated surface parameters."""
@@ -371,8 +292,3 @@ class SimulationTab(ttk.Frame):
             messagebox.showinfo("Info", "Brak interfejsów do raportowania.")
             return
         self._show_results_window("Raport Mikropowierzchni", data, ['name', 'sig_s', 'm_s', 'k_s', 'e_s', 'hc_soft'])
-
-    # --- Manager events ---
-    def _on_manager_event(self, event_type, data):
-        # currently UI handled directly; hook reserved for future updates
-        pass
\ No newline at end of file
@@ -9,6 +9,9 @@ from models import Geometry, Interface
 from dialogs import GeometryDialog
 from controllers.system_controller import SystemManager
 
+# Manager events the view reacts to: removed-TCR logging, and one redraw per (batched) change
+_REDRAW_EVENTS = ('interfaces_rebuilt', 'bulk_changed')
+
 
 class SystemTab(ttk.Frame):
     def __init__(self, parent, app):
@@ -17,10 +20,11 @@ class SystemTab(ttk.Frame):
 
         # Controller (business logic)
         self.manager = SystemManager(app=self.app)
-        self.manager.subscribe(self._on_manager_event)
+        self.manager.subscribe_safe(self._on_manager_event, events=_REDRAW_EVENTS)
 
         # View state
         self.system_saved = False
+        self._tcr_vars = []  # BooleanVar per interface checkbox
         
         # Main layout
         frm_top = ttk.Frame(self)
@@ -72,8 +76,8 @@ class SystemTab(ttk.Frame):
         if dialog.result:
             success, msg = self.manager.add_geometry(dialog.result, index)
             if success:
+                # Canvas is redrawn on the manager's bulk_changed event
                 self.app.log(f'✓ {msg}')
-                self._redraw_canvas()
             else:
                 messagebox.showwarning('Warning', msg)
                 self.app.log(f'! {msg} — odrzucono')
@@ -93,7 +97,7 @@ class SystemTab(ttk.Frame):
         """Redraw the visualization of geometries and interfaces."""
         self.canvas.delete('all')
         
-        geoms = self.manager.get_geometries()
+        geoms = self.manager.geometries
         if not geoms:
             # Calculate canvas dimensions for centering
             canvas_width = self.canvas.winfo_width()
@@ -165,8 +169,10 @@ class SystemTab(ttk.Frame):
         """Redraw TCR checkboxes in the right panel."""
         for w in self.tcr_frame.winfo_children():
             w.destroy()
+        # Checkbox variables, index-aligned with the manager's interfaces (kept alive here)
+        self._tcr_vars = []
         
-        for i, interface in enumerate(self.manager.get_interfaces()):
+        for i, interface in enumerate(self.manager.interfaces):
             var = tk.BooleanVar(value=interface.has_tcr)
             cb = ttk.Checkbutton(
                 self.tcr_frame,
@@ -175,8 +181,7 @@ class SystemTab(ttk.Frame):
                 command=lambda idx=i, v=var: self._on_tcr_change(idx, v)
             )
             cb.pack(anchor='w', padx=5, pady=2)
-            # Store reference on interface object for UI convenience
-            self.manager.interfaces[i]._tcr_var = var
+            self._tcr_vars.append(var)
     
     def _on_tcr_change(self, interface_idx, var):
         """Update TCR flag when checkbox is toggled."""
@@ -199,7 +204,7 @@ class SystemTab(ttk.Frame):
     
     def _edit_geometry(self, index):
         """Edit an existing geometry."""
-        geoms = self.manager.get_geometries()
+        geoms = self.manager.geometries
         geom = geoms[index]
         
         def on_delete():
@@ -207,7 +212,6 @@ class SystemTab(ttk.Frame):
             success, msg = self.manager.remove_geometry(index)
             if success:
                 self.app.log(f'✗ {msg}')
-                self._redraw_canvas()
         
         dialog = GeometryDialog(self, geometry=geom, on_delete=on_delete)
         self.wait_window(dialog)
@@ -220,7 +224,6 @@ class SystemTab(ttk.Frame):
             success, msg = self.manager.update_geometry(index, dialog.result)
             if success:
                 self.app.log(f'✓ {msg}')
-                self._redraw_canvas()
             else:
                 messagebox.showwarning('Warning', msg)
                 self.app.log(f'! {msg} — odrzucono')
@@ -237,8 +240,6 @@ class SystemTab(ttk.Frame):
         
         success, msg = self.manager.import_from_file(file_path)
         if success:
-            # Count taken from message, ensure UI refresh
-            self._redraw_canvas()
             messagebox.showinfo('Success', msg)
             self.app.log(f'✓ Zaimportowano geometrię z pliku — {msg}')
         else:
@@ -277,15 +278,16 @@ class SystemTab(ttk.Frame):
         
         # Store system in parent app
         if hasattr(self.app, 'system_geometries'):
-            self.app.system_geometries = self.manager.get_geometries()
-            self.app.system_interfaces = self.manager.get_interfaces()
+            # Snapshot: later edits must not leak into the saved system before the next Save
+            self.app.system_geometries = self.manager.geometries_snapshot()
+            self.app.system_interfaces = self.manager.interfaces_snapshot()
             
             # Create simple system object for easier access
             class System:
                 pass
             sys = System()
-            sys.geometries = self.manager.get_geometries()
-            sys.interfaces = self.manager.get_interfaces()
+            sys.geometries = self.app.system_geometries
+            sys.interfaces = self.app.system_interfaces
             self.app.system = sys
 
         self.system_saved = True
@@ -308,20 +310,20 @@ class SystemTab(ttk.Frame):
 
     # --- Manager events -> View updates ---
     def _on_manager_event(self, event_type, data):
-        if event_type in ('geometry_added', 'geometry_removed', 'geometry_updated', 'interfaces_rebuilt', 'imported'):
-            # Handle removed TCR logs
-            if event_type == 'interfaces_rebuilt':
-                removed_tcrs = data.get('removed_tcrs', [])
-                current_names = {g.name for g in self.manager.get_geometries()}
-                for top_name, bot_name in removed_tcrs:
-                    removed_geom = None
-                    if top_name not in current_names:
-                        removed_geom = top_name
-                    elif bot_name not in current_names:
-                        removed_geom = bot_name
-                    if removed_geom:
-                        self.app.log(f'✗ Usunięto TCR: {top_name}→{bot_name} na skutek usunięcia bryły: {removed_geom}')
-                    else:
-                        self.app.log(f'✗ Usunięto TCR: {top_name}→{bot_name}')
-            # Redraw UI consistently
+        # Subscribed to _REDRAW_EVENTS only
+        if event_type == 'bulk_changed':
             self._redraw_canvas()
+        elif event_type == 'interfaces_rebuilt':
+            # Handle removed TCR logs
+            removed_tcrs = data.get('removed_tcrs', [])
+            current_names = {g.name for g in self.manager.geometries}
+            for top_name, bot_name in removed_tcrs:
+                removed_geom = None
+                if top_name not in current_names:
+                    removed_geom = top_name
+                elif bot_name not in current_names:
+                    removed_geom = bot_name
+                if removed_geom:
+                    self.app.log(f'✗ Usunięto TCR: {top_name}→{bot_name} na skutek usunięcia bryły: {removed_geom}')
+                else:
+                    self.app.log(f'✗ Usunięto TCR: {top_name}→{bot_name}')
@@ -0,0 +1,100 @@
+"""
+Reusable Tk widgets shared by the tabs.
+"""
+from tkinter import ttk
+
+
+class ScrollableTable(ttk.Frame):
+    """Read-only table: a headings-only ttk.Treeview with vertical and horizontal scrollbars.
+
+    The Treeview draws only the visible rows, so large result sets need no per-cell widgets
+    and no canvas scrollregion bookkeeping. `width` is one pixel width for every column,
+    or a sequence with one width per column.
+    """
+    def __init__(self, parent, columns, headings=None, width=80, anchor='w'):
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        headings = headings or self.columns
+        widths = (width,) * len(self.columns) if isinstance(width, int) else tuple(width)
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings')
+        vsb = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        hsb = ttk.Scrollbar(self, orient='horizontal', command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        for col, text, col_width in zip(self.columns, headings, widths):
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=col_width, anchor=anchor)
+
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='we')
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+    def insert_rows(self, rows):
+        """Append rows (sequences of already formatted cell values, in column order)."""
+        insert = self.tree.insert
+        for values in rows:
+            insert('', 'end', values=values)
+
+    def insert_rows_chunked(self, rows, chunk=500, on_progress=None):
+        """Insert `rows` in chunks from idle callbacks, so the window paints and scrolls while it fills.
+
+        `on_progress(inserted, total)` is called after every chunk.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        total = len(rows)
+
+        def insert_chunk(start=0):
+            if not self.winfo_exists():  # window closed while filling
+                return
+            end = min(start + chunk, total)
+            self.insert_rows(rows[start:end])
+            if on_progress is not None:
+                on_progress(end, total)
+            if end < total:
+                self.after_idle(insert_chunk, end)
+
+        insert_chunk()
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+
+
+class Debouncer:
+    """Collapse a burst of calls (e.g. <Configure> events during a resize) into one call of `func`,
+    made `delay_ms` after the last one. Event arguments are ignored.
+    """
+    def __init__(self, widget, func, delay_ms=50):
+        self.widget = widget
+        self.func = func
+        self.delay_ms = delay_ms
+        self._after_id = None
+
+    def __call__(self, *args):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        if self.widget.winfo_exists():  # skip if the widget was destroyed meanwhile
+            self.func()
+
+
+def run_in_background(widget, executor, func, on_done, *args, poll_ms=50):
+    """Run func(*args) on `executor` and call on_done(future) on the Tk thread once it has finished.
+
+    Completion is polled with widget.after, so `func` must not touch Tk; on_done is skipped
+    if the widget is gone by then.
+    """
+    future = executor.submit(func, *args)
+
+    def poll():
+        if not future.done():
+            widget.after(poll_ms, poll)
+        elif widget.winfo_exists():
+            on_done(future)
+
+    widget.after(poll_ms, poll)
+    return future